@@ -8,9 +8,9 @@ Architecture
 ------------
 ::
 
-    ┌────────────┐  float32   ┌───────────┐  base64/JSON  ┌───────────┐
+    ┌────────────┐  float32   ┌───────────┐  JSON + PCM   ┌───────────┐
     │ sounddevice│ ─callback→ │  Queue     │ ─pub thread→  │  ZeroMQ   │
-    │ InputStream│            │ (int16 b64)│               │ PUB :5555 │
+    │ InputStream│            │ (int16 PCM)│               │ PUB :5555 │
     └────────────┘            └───────────┘               └───────────┘
 
 The sounddevice callback runs on a C-level audio thread that is **not**
@@ -20,11 +20,14 @@ threads safely.
 Message payload (inside the ``data`` field of the bus envelope)::
 
     {
-        "samples":     "<base64-encoded int16 PCM bytes>",
         "timestamp":   "<ISO 8601 UTC>",
         "sample_rate": 16000
     }
 
+The samples themselves travel as little-endian int16 PCM in the message's
+binary frame (``envelope["binary"]`` on the receiving side), so they are
+never base64-encoded or embedded in JSON.
+
 Usage::
 
     from src.core.audio_capture import AudioCapture, AudioConfig
@@ -37,7 +40,6 @@ Usage::
 
 from __future__ import annotations
 
-import base64
 import logging
 import queue
 import threading
@@ -51,7 +53,7 @@ import sounddevice as sd
 from scipy.signal import resample as _scipy_resample
 import zmq
 
-from src.core.message_bus import AUDIO_PORT, MessageBus
+from src.core.message_bus import AUDIO_HWM, AUDIO_PORT, MessageBus
 
 # ---------------------------------------------------------------------------
 # Module-level logger
@@ -203,8 +205,8 @@ class AudioCapture:
     ) -> None:
         """Called by sounddevice on the audio thread for each chunk.
 
-        Converts float32 samples to int16, base64-encodes them, and puts
-        the result on the internal queue.  This method must be fast and
+        Converts float32 samples to int16 PCM bytes and puts them, with
+        their metadata, on the internal queue.  This method must be fast and
         must **not** touch ZeroMQ sockets.
 
         Parameters
@@ -239,12 +241,11 @@ class AudioCapture:
                 flat_samples, effective_native, self.config.sample_rate,
             )
 
-        raw_bytes: bytes = flat_samples.tobytes()
-        b64_samples: str = base64.b64encode(raw_bytes).decode("ascii")
-
         payload: dict[str, Any] = {
-            "samples": b64_samples,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            # Raw PCM; _publish() sends it as the binary frame.
+            "samples": flat_samples.tobytes(),
+            # Formatted by the bus encoder, off this real-time thread.
+            "timestamp": datetime.now(timezone.utc),
             "sample_rate": self.config.sample_rate,
         }
 
@@ -273,7 +274,7 @@ class AudioCapture:
 
         # Bind publisher socket (idempotent guard).
         if self._publisher is None:
-            self._publisher = self.bus.create_publisher(AUDIO_PORT)
+            self._publisher = self.bus.create_publisher(AUDIO_PORT, hwm=AUDIO_HWM)
 
         self.running = True
         effective_native: int = self.config.native_rate or self.config.sample_rate
@@ -334,8 +335,7 @@ class AudioCapture:
                 continue
 
             if self._publisher is not None:
-                self.bus.publish(self._publisher, topic="audio", data=payload)
-                self.published_count += 1
+                self._publish(payload)
 
                 if self.published_count % 50 == 1:
                     logger.debug(
@@ -350,8 +350,7 @@ class AudioCapture:
             try:
                 payload = self._queue.get_nowait()
                 if self._publisher is not None:
-                    self.bus.publish(self._publisher, topic="audio", data=payload)
-                    self.published_count += 1
+                    self._publish(payload)
                     remaining += 1
             except queue.Empty:
                 break
@@ -364,6 +363,15 @@ class AudioCapture:
             self.callback_count,
         )
 
+    def _publish(self, payload: dict[str, Any]) -> None:
+        """Publish one queued chunk: metadata as JSON, PCM as the binary frame."""
+        samples: bytes = payload.pop("samples")
+        self.bus.publish(
+            self._publisher, topic="audio", data=payload,
+            timestamp=payload["timestamp"], binary=samples,
+        )
+        self.published_count += 1
+
     def _resolve_device(self) -> int | None:
         """Resolve the PortAudio device index from config.
 
@@ -500,8 +508,7 @@ if __name__ == "__main__":
         data = envelope["data"]
 
         # Decode and compute RMS (Root Mean Square) level.
-        raw_bytes = base64.b64decode(data["samples"])
-        samples = np.frombuffer(raw_bytes, dtype=np.int16).astype(np.float32)
+        samples = np.frombuffer(envelope["binary"], dtype=np.int16).astype(np.float32)
         rms = float(np.sqrt(np.mean(samples ** 2)))
         chunks_received += 1
 
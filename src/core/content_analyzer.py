@@ -9,19 +9,34 @@ Subscribes to TRANSCRIPT_PORT (5556), publishes to STRESS_PORT (5557) and TACTIC
 from __future__ import annotations
 
 import logging
+import multiprocessing
+import os
+import platform
+import queue
 import re
+import sys
 import threading
 import time
-from collections import deque
-from dataclasses import asdict, dataclass, field
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Optional, Tuple
+from typing import Any, Callable, Optional, Tuple
 
 import numpy as np
 import zmq
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+
+try:
+    import ahocorasick
+except ImportError:  # optional — the minimal-set substring scan is used when unavailable
+    ahocorasick = None
+
+try:
+    import re2
+except ImportError:  # optional — stdlib re is used when unavailable
+    re2 = None
 
 from src.core.message_bus import (
     STRESS_PORT,
@@ -174,7 +189,6 @@ TIER1_PHRASES = [
     "protect your money",
     "wire money to a safe",
     # === Verification Codes ===
-    "read you the code",
     "verification code",
     "code that was sent",
     "code on my phone",
@@ -196,6 +210,47 @@ TIER1_PHRASES = [
     "pay right now",
 ]
 
+
+def _build_tier1_index(phrases: list[str]) -> tuple[list[str], dict[str, list[str]]]:
+    """Split *phrases* into a minimal scan set and a dominated-phrase map.
+
+    A phrase that contains another listed phrase can only match when that
+    shorter phrase does, so only the minimal phrases are scanned; each maps
+    to the longer phrases it dominates.  Exact duplicates are dropped.
+    """
+    unique: list[str] = []
+    seen: set[str] = set()
+    for phrase in phrases:
+        if phrase in seen:
+            logger.warning("Duplicate Tier 1 phrase ignored: %r", phrase)
+            continue
+        seen.add(phrase)
+        unique.append(phrase)
+
+    minimal = [p for p in unique if not any(q != p and q in p for q in unique)]
+    expansions: dict[str, list[str]] = {p: [] for p in minimal}
+    for phrase in unique:
+        for root in minimal:
+            if root != phrase and root in phrase:
+                expansions[root].append(phrase)
+    return minimal, expansions
+
+
+_TIER1_MINIMAL, _TIER1_EXPANSIONS = _build_tier1_index(TIER1_PHRASES)
+_TIER1_ORDER = {p: i for i, p in reversed(list(enumerate(TIER1_PHRASES)))}
+
+
+def _build_tier1_automaton(phrases: list[str]) -> Any:
+    """Aho–Corasick automaton over *phrases*: one pass finds every match."""
+    automaton = ahocorasick.Automaton()
+    for phrase in phrases:
+        automaton.add_word(phrase, phrase)
+    automaton.make_automaton()
+    return automaton
+
+
+_TIER1_AUTOMATON = _build_tier1_automaton(TIER1_PHRASES) if ahocorasick is not None else None
+
 # ---------------------------------------------------------------------------
 # Tier 2: Scam scenario descriptions (for semantic similarity)
 # ---------------------------------------------------------------------------
@@ -341,6 +396,79 @@ BENIGN_PATTERNS = [
 ]
 
 
+def _compile_benign(pattern: str) -> Any:
+    """Compile a case-insensitive benign pattern.
+
+    Uses RE2 (linear-time, no backtracking on the ``.*`` / ``.{0,25}``
+    gaps) when ``google-re2`` is installed, otherwise stdlib ``re``.
+    """
+    if re2 is not None:
+        return re2.compile("(?i)" + pattern)
+    return re.compile(pattern, re.IGNORECASE)
+
+
+# ---------------------------------------------------------------------------
+# Prosodics markers
+# ---------------------------------------------------------------------------
+
+# "?", runs of dots, and the multi-word fillers, counted in one scan.  The
+# fillers' trailing space is a lookahead so "you know i mean" counts both.
+_PROSODY_RE = re.compile(r"(\?)|(\.{2,})|( you know(?= ))|( i mean(?= ))")
+
+# Single-word markers, looked up once per token (the two sets are disjoint).
+_HESITATION_MARKERS = frozenset({"um", "uh", "er", "ah", "hmm", "well", "like"})
+_QUESTION_WORDS = frozenset({"what", "why", "how", "when", "where", "who", "huh"})
+
+_UNCERTAINTY_PHRASES = (
+    "i think", "i guess", "maybe", "i'm not sure", "i don't know",
+    "is that right", "is that safe", "are you sure",
+)
+
+
+# ---------------------------------------------------------------------------
+# Tactic scoring constants
+# ---------------------------------------------------------------------------
+
+_TACTIC_BASELINE: dict[str, float] = {
+    k: 0.1 for k in ("urgency", "authority", "fear", "isolation", "financial")
+}
+
+# Tier 1 hints: a phrase containing any keyword raises those tactics to at
+# least the given scores.
+_PHRASE_HINT_RULES: tuple[tuple[tuple[str, ...], tuple[tuple[str, float], ...]], ...] = (
+    (("arrest", "warrant", "jail"), (("fear", 0.8), ("authority", 0.7))),
+    (("don't tell", "won't tell", "secret"), (("isolation", 0.85),)),
+    (("social security", "ssn"), (("authority", 0.75),)),
+    (("gift card", "bitcoin", "wire"), (("financial", 0.85),)),
+    (("remote access", "download", "teamviewer"), (("isolation", 0.8),)),
+)
+
+
+def _phrase_hints(phrase: str) -> tuple[tuple[str, float], ...]:
+    """(tactic, minimum score) pairs that the rules give a lowercase *phrase*."""
+    return tuple(
+        hint
+        for keywords, hints in _PHRASE_HINT_RULES
+        if any(k in phrase for k in keywords)
+        for hint in hints
+    )
+
+
+# Resolved once per phrase so analysis does one dict lookup per match.
+_TIER1_HINTS: dict[str, tuple[tuple[str, float], ...]] = {
+    p: _phrase_hints(p) for p in TIER1_PHRASES
+}
+
+# Label shown beside an elevated tactic bar.
+_TACTIC_REASONS: dict[str, str] = {
+    "financial": "gift card / payment request",
+    "authority": "official impersonation",
+    "fear": "threats or pressure",
+    "urgency": "time pressure",
+    "isolation": "secrecy / don't tell",
+}
+
+
 # ---------------------------------------------------------------------------
 # Result dataclasses
 # ---------------------------------------------------------------------------
@@ -368,6 +496,114 @@ class SentimentResult:
     compound: float = 0.0
 
 
+# Exact-transcript Tier 2 results kept per analyzer (LRU).
+_TIER2_CACHE_SIZE = 256
+
+# (score, scenario, category, top-k as (scenario, category, score))
+_Tier2Result = Tuple[float, str, str, list[tuple[str, str, float]]]
+_NO_TIER2: _Tier2Result = (0.0, "", "", [])
+
+
+# ---------------------------------------------------------------------------
+# Published payloads
+# ---------------------------------------------------------------------------
+
+
+@dataclass(slots=True)
+class StressMessage:
+    """``data`` of a ``stress`` message on STRESS_PORT.
+
+    Equality ignores the timestamp, so an unchanged reading compares equal.
+    """
+
+    stress_score: float
+    speech_patterns: dict[str, Any]
+    emotions: dict[str, float]
+    confidence: float
+    timestamp: str = field(compare=False)
+
+
+@dataclass(slots=True)
+class TacticMessage:
+    """``data`` of a ``tactics`` message on TACTIC_PORT."""
+
+    tactics: dict[str, float]
+    tactic_labels: dict[str, str]
+    detection_trigger: dict[str, str]
+    top_scenarios: list[dict[str, Any]]
+    risk_level: str
+    risk_score: float
+    risk_factors: list[str]
+    transcript: str
+    word_count: int
+    inference_time_ms: float
+    timestamp: str
+
+
+# ---------------------------------------------------------------------------
+# Shared VADER analyzer
+# ---------------------------------------------------------------------------
+
+_VADER: Optional[SentimentIntensityAnalyzer] = None
+_VADER_LOCK = threading.Lock()
+
+
+def _shared_vader() -> SentimentIntensityAnalyzer:
+    """Return the process-wide VADER analyzer, loading its lexicon once.
+
+    ``polarity_scores`` keeps no per-call state, so one instance is safe to
+    share between ContentAnalyzer instances and threads.
+    """
+    global _VADER
+    with _VADER_LOCK:
+        if _VADER is None:
+            _VADER = SentimentIntensityAnalyzer()
+        return _VADER
+
+
+def _truncate(text: str, limit: int) -> str:
+    """*text* cut to *limit* characters with an ellipsis when longer."""
+    return text[:limit] + "…" if len(text) > limit else text
+
+
+# ---------------------------------------------------------------------------
+# Embedder backends
+# ---------------------------------------------------------------------------
+
+EMBEDDING_BACKENDS = ("torch", "onnx-int8")
+
+
+def _onnx_int8_file() -> str:
+    """Prebuilt int8 ONNX export in the model repo that suits this CPU."""
+    if platform.machine().lower() in ("aarch64", "arm64"):
+        return "onnx/model_qint8_arm64.onnx"  # Jetson / Raspberry Pi
+    return "onnx/model_quint8_avx2.onnx"
+
+
+def _load_embedder(model: str, backend: str) -> SentenceTransformer:
+    """Load the sentence transformer on CPU with the requested *backend*.
+
+    ``"onnx-int8"`` runs a dynamically quantized ONNX export through ONNX
+    Runtime (needs ``sentence-transformers[onnx]``); ``"torch"`` is the
+    FP32 PyTorch model.
+    """
+    if backend == "torch":
+        return SentenceTransformer(model, device="cpu")
+    if backend == "onnx-int8":
+        return SentenceTransformer(
+            model, device="cpu", backend="onnx",
+            model_kwargs={"file_name": _onnx_int8_file()},
+        )
+    raise ValueError(f"Unknown embedding backend {backend!r}; expected one of {EMBEDDING_BACKENDS}")
+
+
+def _set_torch_threads(n: int) -> None:
+    """Cap torch's intra-op CPU threads; process-wide, so only at startup."""
+    import torch
+
+    torch.set_num_threads(n)
+
+
 # ---------------------------------------------------------------------------
 # ContentAnalyzer
 # ---------------------------------------------------------------------------
@@ -379,59 +615,155 @@ class ContentAnalyzer:
     def __init__(
         self,
         embedding_model: str = "all-MiniLM-L6-v2",
+        embedding_backend: str = "torch",
     ) -> None:
         logger.info("Initializing ContentAnalyzer...")
-        self.vader = SentimentIntensityAnalyzer()
-        logger.info("Loading sentence transformer: %s", embedding_model)
-        self.embedder = SentenceTransformer(embedding_model, device="cpu")
+        self.vader = _shared_vader()
+        logger.info("Loading sentence transformer: %s (%s)", embedding_model, embedding_backend)
+        self.embedder = _load_embedder(embedding_model, embedding_backend)
 
         # Pre-compute scenario embeddings at startup
         logger.info("Pre-computing scenario embeddings...")
         self.scenario_descriptions = [s[0] for s in SCAM_SCENARIOS]
         self.scenario_categories = [s[1] for s in SCAM_SCENARIOS]
-        self.scenario_embeddings = self.embedder.encode(self.scenario_descriptions)
-
-        self.benign_patterns = [re.compile(p, re.IGNORECASE) for p in BENIGN_PATTERNS]
+        self.scenario_embeddings = self.embedder.encode(
+            self.scenario_descriptions, convert_to_tensor=False, show_progress_bar=False,
+        )
+        # Unit rows, so Tier 2 cosine similarity is one matvec per query.
+        emb = np.array(self.scenario_embeddings, dtype=np.float32)
+        emb /= np.linalg.norm(emb, axis=1, keepdims=True).clip(min=1e-12)
+        self.scenario_embeddings_n = emb
+
+        self._topk = 3  # scenarios reported per analysis
+        # Tier 2 results of recent transcripts, most recently used last.
+        self._tier2_cache: OrderedDict[str, _Tier2Result] = OrderedDict()
+        self._tier2_cache_lock = threading.Lock()
+        # Similarity rows for one encode batch, reused across calls.
+        self._sim_buf = np.empty((32, len(SCAM_SCENARIOS)), dtype=np.float32)
+        # Tier 2 runs here while the cheap checks run on the caller thread;
+        # encode() releases the GIL inside torch/BLAS.
+        self._tier2_exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tier2")
+
+        self.benign_patterns = [_compile_benign(p) for p in BENIGN_PATTERNS]
+        # All patterns as one alternation: a single scan settles the common
+        # no-benign-context case.
+        self._benign_any = _compile_benign("|".join(f"(?:{p})" for p in BENIGN_PATTERNS))
         self.call_start_time: Optional[float] = None
         self.risk_history: deque[float] = deque(maxlen=20)
         logger.info("ContentAnalyzer ready (%d Tier 1 phrases, %d scenarios)",
                     len(TIER1_PHRASES), len(SCAM_SCENARIOS))
 
-    def _check_tier1(self, transcript: str) -> list[str]:
-        """Tier 1: Unambiguous phrase matches (substring)."""
-        transcript_lower = transcript.lower()
-        matches = []
-        for phrase in TIER1_PHRASES:
-            if phrase in transcript_lower:
-                matches.append(phrase)
-        return matches
-
-    def _check_tier2(self, transcript: str) -> Tuple[float, str, str]:
-        """Tier 2: Semantic similarity to scam scenarios. Returns (score, scenario, category)."""
-        words = transcript.split()
-        if len(words) < 3:
-            return 0.0, "", ""
-
-        encoding = self.embedder.encode([transcript])
-        similarities = cosine_similarity(encoding, self.scenario_embeddings)[0]
-        max_idx = int(np.argmax(similarities))
-        score = float(similarities[max_idx])
-        scenario = self.scenario_descriptions[max_idx]
-        category = self.scenario_categories[max_idx]
-        return score, scenario, category
+    def close(self) -> None:
+        """Shut down the Tier 2 worker thread."""
+        self._tier2_exec.shutdown(wait=True)
+
+    def _check_tier1(self, transcript: str, t_lower: Optional[str] = None) -> list[str]:
+        """Tier 1: Unambiguous phrase matches (substring).
+
+        *t_lower* is ``transcript.lower()`` when the caller already has it.
+        """
+        transcript_lower = transcript.lower() if t_lower is None else t_lower
+        if _TIER1_AUTOMATON is not None:
+            found = {phrase for _, phrase in _TIER1_AUTOMATON.iter(transcript_lower)}
+        else:
+            found = set()
+            for root in _TIER1_MINIMAL:
+                if root not in transcript_lower:
+                    continue
+                found.add(root)
+                for phrase in _TIER1_EXPANSIONS[root]:
+                    if phrase not in found and phrase in transcript_lower:
+                        found.add(phrase)
+        # Report in TIER1_PHRASES order, as a linear scan would.
+        return sorted(found, key=_TIER1_ORDER.__getitem__)
+
+    def _check_tier2(self, transcript: str) -> _Tier2Result:
+        """Tier 2: Semantic similarity to scam scenarios.
+
+        Returns (score, scenario, category) of the best match, plus the
+        top-k matches as (scenario, category, score), best first.
+        """
+        return self._check_tier2_batch([transcript])[0]
+
+    def _check_tier2_batch(self, transcripts: list[str]) -> list[_Tier2Result]:
+        """Tier 2 for several transcripts: one encode call and one matmul."""
+        results: list[_Tier2Result] = [_NO_TIER2] * len(transcripts)
+        rows: list[int] = []
+        for i, t in enumerate(transcripts):
+            known = self._tier2_known(t)
+            if known is not None:
+                results[i] = known
+            else:
+                rows.append(i)
+        if not rows:
+            return results
+
+        queries = self.embedder.encode(
+            [transcripts[i] for i in rows], batch_size=32, normalize_embeddings=True,
+            convert_to_tensor=False, show_progress_bar=False,
+        )
+        queries = np.asarray(queries, dtype=np.float32)
+        with self._tier2_cache_lock:
+            # The lock also guards the reused similarity buffer.
+            if len(rows) > len(self._sim_buf):
+                self._sim_buf = np.empty((len(rows), len(SCAM_SCENARIOS)), dtype=np.float32)
+            sims = np.matmul(queries, self.scenario_embeddings_n.T, out=self._sim_buf[:len(rows)])
+            for i, similarities in zip(rows, sims):
+                results[i] = self._tier2_cache[transcripts[i]] = self._rank_scenarios(similarities)
+            while len(self._tier2_cache) > _TIER2_CACHE_SIZE:
+                self._tier2_cache.popitem(last=False)
+        return results
+
+    def _tier2_known(self, transcript: str) -> Optional[_Tier2Result]:
+        """Tier 2 result available without the embedder, else ``None``:
+        too short to score, or cached from a recent identical transcript."""
+        if len(transcript.split()) < 3:
+            return _NO_TIER2
+        with self._tier2_cache_lock:
+            cached = self._tier2_cache.get(transcript)
+            if cached is not None:
+                self._tier2_cache.move_to_end(transcript)
+            return cached
+
+    def _rank_scenarios(self, similarities: np.ndarray) -> _Tier2Result:
+        """Best match and top-k from one row of scenario similarities."""
+        # O(N) top-k selection; only the k survivors get sorted.
+        k = min(self._topk, len(similarities))
+        idx = np.argpartition(similarities, -k)[-k:]
+        idx = idx[np.argsort(-similarities[idx])]
+        top = [
+            (self.scenario_descriptions[i], self.scenario_categories[i], float(similarities[i]))
+            for i in idx
+        ]
+        scenario, category, score = top[0]
+        return score, scenario, category, top
 
     def _check_benign_context(self, transcript: str) -> Tuple[bool, list[str]]:
         """Strong benign context that could explain suspicious words.
         Returns (is_benign, list of pattern regex strings that matched).
         """
+        if not self._benign_any.search(transcript):
+            return False, []
+        # Alternation matches don't overlap, so list every pattern separately.
         matched: list[str] = []
         for i, pattern in enumerate(self.benign_patterns):
             if pattern.search(transcript):
                 matched.append(BENIGN_PATTERNS[i][:50])  # truncate long regex for log
         return bool(matched), matched
 
-    def _analyze_prosodics(self, transcript: str, duration_hint: float = 2.5) -> ProsodicsResult:
-        words = transcript.split()
+    def _analyze_prosodics(
+        self,
+        transcript: str,
+        duration_hint: float = 2.5,
+        t_lower: Optional[str] = None,
+        words: Optional[list[str]] = None,
+    ) -> ProsodicsResult:
+        """Speech-pattern counters; *t_lower* / *words* are the lowercased
+        transcript and its ``split()`` when the caller already has them."""
+        if t_lower is None:
+            t_lower = transcript.lower()
+        if words is None:
+            words = t_lower.split()
         word_count = len(words)
         duration_min = max(duration_hint, 0.1) / 60.0
         wpm = word_count / duration_min if duration_min > 0 else 0.0
@@ -446,42 +778,41 @@ class ContentAnalyzer:
         else:
             wpm_label = "—"
 
-        # Hesitation: fillers + "you know", "I mean"
-        hesitation_markers = ["um", "uh", "er", "ah", "hmm", "well", "like"]
-        hesitation_count = sum(
-            1 for w in words if w.lower().strip(".,!?") in hesitation_markers
-        )
-        t_lower = transcript.lower()
-        hesitation_count += t_lower.count(" you know ")
-        hesitation_count += t_lower.count(" i mean ")
+        # Single scan for "?", pauses ("..", "...") and "you know" / "I mean"
+        question_marks = pause_indicators = filler_phrases = 0
+        for qmark, dots, _, _ in _PROSODY_RE.findall(t_lower):
+            if qmark:
+                question_marks += 1
+            elif dots:
+                # Same as counting "..." and ".." separately over the run.
+                pause_indicators += len(dots) // 3 + len(dots) // 2
+            else:
+                filler_phrases += 1
+
+        # Single pass over tokens: hesitation fillers, question words, and
+        # first-seen hesitation markers for display.
+        hesitation_count = question_words = 0
+        recent_matches: list[str] = []
+        for w in words:
+            wc = w.strip(".,!?")
+            if wc in _HESITATION_MARKERS:
+                hesitation_count += 1
+                if wc not in recent_matches:
+                    recent_matches.append(wc)
+            elif wc in _QUESTION_WORDS:
+                question_words += 1
+
+        hesitation_count += filler_phrases
         hesitation_label = "elevated" if hesitation_count >= 2 else ("low" if hesitation_count > 0 else "—")
-
-        # Questions
-        question_words = ["what", "why", "how", "when", "where", "who", "huh"]
-        question_indicators = transcript.count("?") + sum(
-            1 for w in words if w.lower().strip(".,!?") in question_words
-        )
+        question_indicators = question_marks + question_words
 
         # Uncertainty phrases
-        uncertainty_phrases = [
-            "i think", "i guess", "maybe", "i'm not sure", "i don't know",
-            "is that right", "is that safe", "are you sure",
-        ]
-        uncertainty_count = sum(1 for p in uncertainty_phrases if p in t_lower)
-
-        # Recent matches for display (hesitations + uncertainty phrases found)
-        recent_matches: list[str] = []
-        for w in words:
-            wc = w.lower().strip(".,!?")
-            if wc in hesitation_markers and wc not in recent_matches:
-                recent_matches.append(wc)
-        for p in uncertainty_phrases:
-            if p in t_lower:
-                recent_matches.append(f'"{p}"')
+        uncertain = [p for p in _UNCERTAINTY_PHRASES if p in t_lower]
+        uncertainty_count = len(uncertain)
+        recent_matches.extend(f'"{p}"' for p in uncertain)
         recent_matches = recent_matches[:5]
 
         speech_rate = word_count / max(duration_hint, 0.1)
-        pause_indicators = transcript.count("...") + transcript.count("..")
         pause_ratio = min(pause_indicators / max(word_count, 1), 1.0)
         confusion_score = min(
             1.0,
@@ -517,34 +848,18 @@ class ContentAnalyzer:
         sentiment: SentimentResult,
     ) -> dict[str, float]:
         """Infer tactics from Tier 1 matches and matched scenario category."""
-        tactics = {k: 0.1 for k in ("urgency", "authority", "fear", "isolation", "financial")}
-
-        if tier1_matches or semantic_score > 0.45:
-            if matched_category == "authority":
-                tactics["authority"] = 0.85
-            if matched_category == "fear":
-                tactics["fear"] = 0.85
-            if matched_category == "urgency":
-                tactics["urgency"] = 0.85
-            if matched_category == "isolation":
-                tactics["isolation"] = 0.85
-            if matched_category == "financial":
-                tactics["financial"] = 0.85
+        tactics = dict(_TACTIC_BASELINE)
+
+        if (tier1_matches or semantic_score > 0.45) and matched_category in tactics:
+            tactics[matched_category] = 0.85
 
         # Tier 1 phrase hints
         for m in tier1_matches:
-            m_l = m.lower()
-            if "arrest" in m_l or "warrant" in m_l or "jail" in m_l:
-                tactics["fear"] = max(tactics["fear"], 0.8)
-                tactics["authority"] = max(tactics["authority"], 0.7)
-            if "don't tell" in m_l or "won't tell" in m_l or "secret" in m_l:
-                tactics["isolation"] = max(tactics["isolation"], 0.85)
-            if "social security" in m_l or "ssn" in m_l:
-                tactics["authority"] = max(tactics["authority"], 0.75)
-            if "gift card" in m_l or "bitcoin" in m_l or "wire" in m_l:
-                tactics["financial"] = max(tactics["financial"], 0.85)
-            if "remote access" in m_l or "download" in m_l or "teamviewer" in m_l:
-                tactics["isolation"] = max(tactics["isolation"], 0.8)
+            hints = _TIER1_HINTS.get(m)
+            if hints is None:
+                hints = _phrase_hints(m)
+            for tactic, score in hints:
+                tactics[tactic] = max(tactics[tactic], score)
 
         if sentiment.negative > 0.3:
             tactics["fear"] = max(tactics["fear"], 0.6)
@@ -557,18 +872,11 @@ class ContentAnalyzer:
     ) -> dict[str, str]:
         """Return human-readable labels for elevated tactic bars."""
         labels: dict[str, str] = {}
-        reasons = {
-            "financial": "gift card / payment request",
-            "authority": "official impersonation",
-            "fear": "threats or pressure",
-            "urgency": "time pressure",
-            "isolation": "secrecy / don't tell",
-        }
         for k, v in tactics.items():
             if v >= 0.5:
-                labels[k] = reasons.get(k, "matched")
+                labels[k] = _TACTIC_REASONS.get(k, "matched")
         if tier1_matches:
-            m_l = tier1_matches[0].lower()
+            m_l = tier1_matches[0]
             if "gift card" in m_l or "bitcoin" in m_l:
                 labels["financial"] = labels.get("financial", "gift card payment request")
             if "remote access" in m_l or "download" in m_l:
@@ -576,16 +884,52 @@ class ContentAnalyzer:
         return labels
 
     def analyze(self, transcript: str, duration_hint: float = 2.5) -> dict[str, Any]:
-        """Run two-tier analysis. Returns dict compatible with dashboard."""
+        """Run two-tier analysis. Returns dict compatible with dashboard.
+
+        ``sentiment`` is the :class:`SentimentResult` itself; the bus
+        serialises dataclasses directly if it is ever published.
+        """
+        start = time.perf_counter()
+        known = self._tier2_known(transcript)
+        if known is not None:
+            # Nothing for the embedder to do; skip the Tier 2 thread hop.
+            return self._analyze(transcript, duration_hint, lambda: known, start)
+        tier2_future = self._tier2_exec.submit(self._check_tier2, transcript)
+        return self._analyze(transcript, duration_hint, tier2_future.result, start)
+
+    def analyze_batch(
+        self, transcripts: list[str], duration_hint: float = 2.5,
+    ) -> list[dict[str, Any]]:
+        """Run :meth:`analyze` on several independent transcripts.
+
+        Tier 2 encodes the whole batch in one call; ``inference_time_ms``
+        counts from the start of the batch.
+        """
         start = time.perf_counter()
+        tier2 = self._check_tier2_batch(transcripts)
+        return [
+            self._analyze(transcript, duration_hint, lambda r=r: r, start)
+            for transcript, r in zip(transcripts, tier2)
+        ]
 
-        prosodics = self._analyze_prosodics(transcript, duration_hint)
+    def _analyze(
+        self,
+        transcript: str,
+        duration_hint: float,
+        tier2: Callable[[], _Tier2Result],
+        start: float,
+    ) -> dict[str, Any]:
+        """Cheap checks, then combine them with the Tier 2 result from *tier2*."""
+        # Lowercase and tokenize once for every check that needs it.
+        t_lower = transcript.lower()
+        words = t_lower.split()
+        prosodics = self._analyze_prosodics(transcript, duration_hint, t_lower, words)
         sentiment = self._analyze_sentiment(transcript)
-
-        tier1_matches = self._check_tier1(transcript)
-        semantic_score, matched_scenario, matched_category = self._check_tier2(transcript)
+        tier1_matches = self._check_tier1(transcript, t_lower)
         is_benign, benign_matched = self._check_benign_context(transcript)
 
+        semantic_score, matched_scenario, matched_category, top_scenarios = tier2()
+
         risk_factors: list[str] = []
         risk_score = 0.0
 
@@ -645,47 +989,61 @@ class ContentAnalyzer:
             }
         elif semantic_score > 0.40:
             detection_trigger = {
-                "phrase": matched_scenario[:50] + "…" if len(matched_scenario) > 50 else matched_scenario,
+                "phrase": _truncate(matched_scenario, 50),
                 "match_type": f"Tier 2 (similarity {semantic_score:.2f})",
                 "category": matched_category.capitalize() + " Pressure",
             }
 
         elapsed_ms = (time.perf_counter() - start) * 1000
 
-        # Debug logging: full analysis trace (only when --debug)
-        transcript_trunc = (transcript[:80] + "…") if len(transcript) > 80 else transcript
-        logger.debug(
-            "[ANALYZER] [ANALYZE] transcript=%r (%d words)",
-            transcript_trunc, len(transcript.split()),
-        )
-        logger.debug("[ANALYZER] [TIER1] matches: %s", tier1_matches)
-        logger.debug(
-            "[ANALYZER] [TIER2] best_score=%.3f scenario=%r",
-            semantic_score, (matched_scenario[:60] + "…") if len(matched_scenario) > 60 else matched_scenario,
-        )
-        logger.debug("[ANALYZER] [BENIGN] patterns_matched: %s", benign_matched)
-        logger.debug(
-            "[ANALYZER] [RESULT] risk_level=%s risk_score=%.2f factors=%s",
-            risk_level, risk_score, risk_factors,
-        )
+        # Debug logging: full analysis trace (only when --debug). Guarded so
+        # the truncations aren't built on every call at INFO.
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "[ANALYZER] [ANALYZE] transcript=%r (%d words)",
+                _truncate(transcript, 80), len(words),
+            )
+            logger.debug("[ANALYZER] [TIER1] matches: %s", tier1_matches)
+            logger.debug(
+                "[ANALYZER] [TIER2] best_score=%.3f scenario=%r",
+                semantic_score, _truncate(matched_scenario, 60),
+            )
+            logger.debug("[ANALYZER] [BENIGN] patterns_matched: %s", benign_matched)
+            logger.debug(
+                "[ANALYZER] [RESULT] risk_level=%s risk_score=%.2f factors=%s",
+                risk_level, risk_score, risk_factors,
+            )
 
         # Important events at INFO (high/medium risk)
         if risk_level in ("high", "medium") and logger.isEnabledFor(logging.INFO):
             logger.info(
                 "[ANALYZER] DETECTION %s (%.2f): %r tier1=%s tier2=%.2f benign=%s",
-                risk_level.upper(), risk_score, transcript_trunc,
+                risk_level.upper(), risk_score, _truncate(transcript, 80),
                 tier1_matches, semantic_score, is_benign,
             )
 
-        prosodics_dict = asdict(prosodics)
+        # Explicit literals instead of dataclasses.asdict(): no field
+        # reflection or deep copy of recent_matches on the hot path.
+        prosodics_dict = {
+            "speech_rate": prosodics.speech_rate,
+            "pause_ratio": prosodics.pause_ratio,
+            "hesitation_count": prosodics.hesitation_count,
+            "question_indicators": prosodics.question_indicators,
+            "confusion_score": prosodics.confusion_score,
+            "wpm": prosodics.wpm,
+            "wpm_label": prosodics.wpm_label,
+            "hesitation_label": prosodics.hesitation_label,
+            "uncertainty_count": prosodics.uncertainty_count,
+            "recent_matches": prosodics.recent_matches,
+        }
         speech_patterns = {
-            "wpm": int(prosodics_dict.get("wpm", 0)),
-            "wpm_label": prosodics_dict.get("wpm_label", "—"),
-            "hesitations": prosodics_dict.get("hesitation_count", 0),
-            "hesitation_label": prosodics_dict.get("hesitation_label", "—"),
-            "questions": prosodics_dict.get("question_indicators", 0),
-            "uncertainty": prosodics_dict.get("uncertainty_count", 0),
-            "recent": prosodics_dict.get("recent_matches", []),
+            "wpm": int(prosodics.wpm),
+            "wpm_label": prosodics.wpm_label,
+            "hesitations": prosodics.hesitation_count,
+            "hesitation_label": prosodics.hesitation_label,
+            "questions": prosodics.question_indicators,
+            "uncertainty": prosodics.uncertainty_count,
+            "recent": prosodics.recent_matches,
         }
         return {
             "risk_level": risk_level,
@@ -697,38 +1055,114 @@ class ContentAnalyzer:
             "tactics": tactics,
             "tactic_labels": tactic_labels,
             "detection_trigger": detection_trigger,
+            "top_scenarios": [
+                {"scenario": sc, "category": cat, "similarity": sim}
+                for sc, cat, sim in top_scenarios
+            ],
             "prosodics": prosodics_dict,
             "speech_patterns": speech_patterns,
-            "sentiment": asdict(sentiment),
+            "sentiment": sentiment,
             "stress_score": prosodics.confusion_score,
             "inference_time_ms": elapsed_ms,
         }
 
 
+# ---------------------------------------------------------------------------
+# Analyzer subprocess
+# ---------------------------------------------------------------------------
+
+_worker_analyzer: Optional[ContentAnalyzer] = None
+
+
+def _init_worker_analyzer(embedding_backend: str, torch_threads: Optional[int] = None) -> None:
+    """Process-pool initializer: load the models once in the worker process."""
+    global _worker_analyzer
+    if torch_threads is not None:
+        _set_torch_threads(torch_threads)
+    _worker_analyzer = ContentAnalyzer(embedding_backend=embedding_backend)
+
+
+def _analyze_in_worker(transcript: str, duration_hint: float) -> dict[str, Any]:
+    """Run ``ContentAnalyzer.analyze`` in the worker process."""
+    assert _worker_analyzer is not None
+    return _worker_analyzer.analyze(transcript, duration_hint=duration_hint)
+
+
 # ---------------------------------------------------------------------------
 # ZeroMQ service
 # ---------------------------------------------------------------------------
 
+_TX_QUEUE_SIZE = 64  # pending publishes before the writer thread starts dropping
+# Transcripts are small, so queue deeply rather than drop finals that arrive
+# while an analysis is running.
+_TRANSCRIPT_HWM = 10_000
+# Buffered transcript segments; if analysis falls behind, the oldest drop.
+_MAX_BUFFERED_SEGMENTS = 512
+
 
 class ContentAnalyzerService:
-    """MessageBus service: subscribe to transcripts, publish stress + tactics."""
+    """MessageBus service: subscribe to transcripts, publish stress + tactics.
+
+    Analysis runs on a worker thread so the main loop keeps draining
+    transcripts while the models run, and publishing runs on a dedicated
+    writer thread that owns the PUB sockets, so the analysis path only
+    enqueues and never waits on a ZeroMQ send.
+
+    With ``use_subprocess=True`` the models live in a single worker process
+    instead, so the pure-Python parts of an analysis (VADER, regexes, risk
+    scoring) no longer hold this process's GIL while transcripts arrive.
+
+    ``torch_threads`` caps torch's CPU threads in whichever process runs the
+    models; ``None`` leaves torch's default.
+    """
 
     def __init__(
         self,
         bus: Optional[MessageBus] = None,
         min_words: int = 8,
         analysis_interval: float = 5.0,
+        use_subprocess: bool = False,
+        embedding_backend: str = "torch",
+        torch_threads: Optional[int] = None,
     ) -> None:
         self.bus = bus or MessageBus()
         self.min_words = min_words
         self.analysis_interval = analysis_interval
-        self._analyzer = ContentAnalyzer()
-        self._accumulated: list[str] = []
-        self._last_analysis = 0.0
+        self._analyzer: Optional[ContentAnalyzer] = None
+        self._worker_pool: Optional[ProcessPoolExecutor] = None
+        if use_subprocess:
+            # Spawn, not fork: the parent already runs ZeroMQ I/O threads.
+            self._worker_pool = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker_analyzer,
+                initargs=(embedding_backend, torch_threads),
+            )
+        else:
+            if torch_threads is not None:
+                _set_torch_threads(torch_threads)
+            self._analyzer = ContentAnalyzer(embedding_backend=embedding_backend)
+        self._accumulated: deque[str] = deque(maxlen=_MAX_BUFFERED_SEGMENTS)
+        # Per-segment word counts, parallel to _accumulated, so evicting a
+        # segment never re-splits it.
+        self._segment_words: deque[int] = deque(maxlen=_MAX_BUFFERED_SEGMENTS)
+        self._word_count = 0  # words in _accumulated, kept incrementally
+        # Monotonic nanoseconds: an integer compare that wall-clock jumps can't skew.
+        self._interval_ns = int(analysis_interval * 1e9)
+        self._last_analysis_ns = 0
         self._stop = threading.Event()
         self._subscriber: Optional[zmq.Socket] = None
         self._stress_pub: Optional[zmq.Socket] = None
         self._tactic_pub: Optional[zmq.Socket] = None
+        # A Queue rather than an inproc:// socket pair: payloads stay Python
+        # objects until the writer thread, so they are serialised only once.
+        self._tx_queue: queue.Queue[Optional[tuple[str, StressMessage | TacticMessage]]] = queue.Queue(
+            maxsize=_TX_QUEUE_SIZE,
+        )
+        self._tx_thread: Optional[threading.Thread] = None
+        self._analysis_exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix="analyzer")
+        self._analysis: Optional[Future[None]] = None  # in-flight analysis, if any
+        self._last_stress: Optional[StressMessage] = None  # last published stress reading
         self.running = False
 
     def start(self) -> None:
@@ -737,13 +1171,22 @@ class ContentAnalyzerService:
         self._subscriber = self.bus.create_subscriber(
             ports=[TRANSCRIPT_PORT],
             topics=["transcript"],
+            hwm=_TRANSCRIPT_HWM,
         )
         self._stress_pub = self.bus.create_publisher(STRESS_PORT)
         self._tactic_pub = self.bus.create_publisher(TACTIC_PORT)
+        # Sockets are created here so bind errors surface to the caller; from
+        # now on only the writer thread touches them.
+        self._tx_thread = threading.Thread(
+            target=self._pub_loop, name="analyzer-pub", daemon=True,
+        )
+        self._tx_thread.start()
         self.running = True
         logger.info(
-            "ContentAnalyzerService started — SUB :%d, PUB stress:%d tactics:%d",
+            "ContentAnalyzerService started — SUB :%d, PUB stress:%d tactics:%d (GIL %s)",
             TRANSCRIPT_PORT, STRESS_PORT, TACTIC_PORT,
+            # Free-threaded builds (3.13t+) run the service's threads in parallel.
+            "enabled" if getattr(sys, "_is_gil_enabled", lambda: True)() else "disabled",
         )
         try:
             self._main_loop()
@@ -757,71 +1200,134 @@ class ContentAnalyzerService:
         self.running = False
 
     def _cleanup(self) -> None:
+        # Let an in-flight analysis finish and enqueue before the writer stops.
+        self._analysis_exec.shutdown(wait=True)
+        if self._tx_thread is not None:
+            self._tx_queue.put(None)  # sentinel: flush and exit
+            self._tx_thread.join(timeout=2.0)
+            self._tx_thread = None
+        if self._worker_pool is not None:
+            self._worker_pool.shutdown(wait=True)
+        if self._analyzer is not None:
+            self._analyzer.close()
         for sock in (self._subscriber, self._stress_pub, self._tactic_pub):
             if sock:
                 sock.close()
 
+    def _pub_loop(self) -> None:
+        """Writer thread: drain ``_tx_queue`` onto the stress/tactic PUB sockets."""
+        sockets = {"stress": self._stress_pub, "tactics": self._tactic_pub}
+        while True:
+            item = self._tx_queue.get()
+            if item is None:
+                return
+            topic, data = item
+            try:
+                # Reuse the payload's timestamp for the envelope.
+                self.bus.publish(sockets[topic], topic, data, data.timestamp)
+            except zmq.ZMQError:
+                logger.exception("[ANALYZER] Failed to publish %s", topic)
+
+    def _enqueue_publish(self, topic: str, data: StressMessage | TacticMessage) -> None:
+        """Hand *data* to the writer thread; drop it if the queue is full."""
+        try:
+            self._tx_queue.put_nowait((topic, data))
+        except queue.Full:
+            logger.warning("[ANALYZER] Publish queue full — dropping %s message", topic)
+
     def _main_loop(self) -> None:
         while not self._stop.is_set():
-            result = self.bus.receive(self._subscriber, timeout_ms=200)
-            if result is None:
-                self._maybe_analyze()
-                continue
-            topic, envelope = result
-            data = envelope.get("data", {})
-            text = (data.get("text", "") or "").strip()
-            if not text or text == "(silence)":
-                continue
-            if data.get("is_final", True):
+            # One wake-up per burst: poll once, then take everything queued.
+            for _topic, envelope in self.bus.drain(self._subscriber, timeout_ms=50):
+                # Cheapest checks first: silence ticks publish an empty text
+                # and are dropped before any string work.
+                data = envelope.get("data")
+                if not data or not data.get("is_final", True):
+                    continue
+                text = data.get("text")
+                if not text:
+                    continue
+                text = text.strip()
+                if not text or text == "(silence)":
+                    continue
+                if len(self._segment_words) == self._segment_words.maxlen:
+                    self._word_count -= self._segment_words[0]
+                n_words = len(text.split())
                 self._accumulated.append(text)
-                logger.debug("Buffered transcript (%d): %s", len(self._accumulated), text[:50])
+                self._segment_words.append(n_words)
+                self._word_count += n_words
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Buffered transcript (%d): %s", len(self._accumulated), text[:50])
             self._maybe_analyze()
 
     def _maybe_analyze(self) -> None:
-        now = time.time()
-        if now - self._last_analysis < self.analysis_interval:
+        now_ns = time.monotonic_ns()
+        if now_ns - self._last_analysis_ns < self._interval_ns:
             return
-        combined = " ".join(self._accumulated).strip()
-        words = combined.split()
-        if len(words) < self.min_words:
+        if self._analysis is not None and not self._analysis.done():
+            return  # one analysis at a time; keep buffering meanwhile
+        word_count = self._word_count
+        if word_count < self.min_words:
             return
-        self._last_analysis = now
-        result = self._analyzer.analyze(combined, duration_hint=self.analysis_interval)
+        combined = " ".join(self._accumulated)
+        self._last_analysis_ns = now_ns
         self._accumulated.clear()
+        self._segment_words.clear()
+        self._word_count = 0
+        self._analysis = self._analysis_exec.submit(self._run_analysis, combined, word_count)
+
+    def _run_analysis(self, combined: str, word_count: int) -> None:
+        """Worker thread: analyze one snapshot of the buffer and enqueue results."""
+        try:
+            if self._worker_pool is not None:
+                result = self._worker_pool.submit(
+                    _analyze_in_worker, combined, self.analysis_interval,
+                ).result()
+            else:
+                result = self._analyzer.analyze(combined, duration_hint=self.analysis_interval)
+        except Exception:
+            logger.exception("[ANALYZER] Analysis failed (%d words)", word_count)
+            return
         ts = datetime.now(timezone.utc).isoformat()
-        stress_data = {
-            "stress_score": result["stress_score"],
-            "speech_patterns": result["speech_patterns"],
-            "emotions": {
-                "arousal": result["stress_score"],
-                "valence": max(0, (result["sentiment"]["compound"] + 1) / 2),
-                "dominance": 1.0 - result["stress_score"],
+        stress_score = result["stress_score"]
+        stress = StressMessage(
+            stress_score=stress_score,
+            speech_patterns=result["speech_patterns"],
+            emotions={
+                "arousal": stress_score,
+                "valence": max(0, (result["sentiment"].compound + 1) / 2),
+                "dominance": 1.0 - stress_score,
             },
-            "confidence": result["confidence"],
-            "timestamp": ts,
-        }
-        self.bus.publish(self._stress_pub, "stress", stress_data)
-        tactic_data = {
-            "tactics": result["tactics"],
-            "tactic_labels": result["tactic_labels"],
-            "detection_trigger": result["detection_trigger"],
-            "risk_level": result["risk_level"],
-            "risk_score": result["risk_score"],
-            "risk_factors": result["risk_factors"],
-            "transcript": combined,
-            "word_count": len(words),
-            "inference_time_ms": result["inference_time_ms"],
-            "timestamp": ts,
-        }
-        self.bus.publish(self._tactic_pub, "tactics", tactic_data)
+            confidence=result["confidence"],
+            timestamp=ts,
+        )
+        # Subscribers keep the last reading, so an identical one is skipped.
+        # Tactics always go out: each carries a new transcript window.
+        if stress != self._last_stress:
+            self._enqueue_publish("stress", stress)
+            self._last_stress = stress
+        self._enqueue_publish("tactics", TacticMessage(
+            tactics=result["tactics"],
+            tactic_labels=result["tactic_labels"],
+            detection_trigger=result["detection_trigger"],
+            top_scenarios=result["top_scenarios"],
+            risk_level=result["risk_level"],
+            risk_score=result["risk_score"],
+            risk_factors=result["risk_factors"],
+            transcript=combined,
+            word_count=word_count,
+            inference_time_ms=result["inference_time_ms"],
+            timestamp=ts,
+        ))
         logger.info(
             "[ANALYZER] Published risk=%s (%.2f) %d words in %.0fms",
-            result["risk_level"], result["risk_score"], len(words), result["inference_time_ms"],
-        )
-        logger.debug(
-            "[ANALYZER] [PUBLISH] transcript=%r port=%d",
-            (combined[:80] + "…") if len(combined) > 80 else combined, TACTIC_PORT,
+            result["risk_level"], result["risk_score"], word_count, result["inference_time_ms"],
         )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "[ANALYZER] [PUBLISH] transcript=%r port=%d",
+                (combined[:80] + "…") if len(combined) > 80 else combined, TACTIC_PORT,
+            )
 
 
 if __name__ == "__main__":
@@ -831,10 +1337,23 @@ if __name__ == "__main__":
     parser.add_argument("--min-words", type=int, default=8)
     parser.add_argument("--interval", type=float, default=5.0)
     parser.add_argument("--debug", "--verbose", action="store_true", dest="debug")
+    parser.add_argument("--subprocess", action="store_true",
+                        help="Run the models in a separate worker process")
+    parser.add_argument("--embedding-backend", choices=EMBEDDING_BACKENDS, default="torch",
+                        help="Sentence-transformer runtime (onnx-int8 needs sentence-transformers[onnx])")
+    # Default leaves cores for the audio and stress processes on the same board.
+    parser.add_argument("--torch-threads", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="CPU threads for torch in the analyzer process (default: half the cores)")
     args = parser.parse_args()
     if args.debug:
         logging.getLogger().setLevel(logging.DEBUG)
-    service = ContentAnalyzerService(min_words=args.min_words, analysis_interval=args.interval)
+    service = ContentAnalyzerService(
+        min_words=args.min_words,
+        analysis_interval=args.interval,
+        use_subprocess=args.subprocess,
+        embedding_backend=args.embedding_backend,
+        torch_threads=args.torch_threads,
+    )
     try:
         service.start()
     except KeyboardInterrupt:
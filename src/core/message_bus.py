@@ -1,14 +1,19 @@
 """ZeroMQ message bus — communication spine for the Anchor pipeline.
 
 Each pipeline stage (audio capture, transcription, stress detection,
-tactic inference) communicates over ZeroMQ PUB/SUB sockets on localhost.
+tactic inference) communicates over ZeroMQ PUB/SUB sockets on localhost
+(TCP loopback by default; ``ANCHOR_TRANSPORT=ipc`` uses Unix domain sockets).
 Messages are JSON-encoded with a standard envelope:
 
     {"timestamp": "<ISO 8601>", "topic": "<str>", "data": {…}}
 
 The publisher sends a two-frame ZeroMQ message:
     Frame 0 (topic):  UTF-8 topic string used for SUB filtering.
-    Frame 1 (body):   JSON-encoded envelope.
+    Frame 1 (body):   JSON-encoded envelope (via ``orjson`` when installed,
+                      otherwise the stdlib ``json`` module).
+    Frame 2 (binary): Optional raw bytes (e.g. int16 PCM audio), carried
+                      outside the JSON so they need no text encoding.
+                      Receivers find them under ``envelope["binary"]``.
 
 Usage:
     bus  = MessageBus()
@@ -16,12 +21,17 @@ Usage:
     sub  = bus.create_subscriber([AUDIO_PORT])
     bus.publish(pub, "audio", {"level": 0.8})
     result = bus.receive(sub, timeout_ms=500)
+    batch  = bus.drain(sub, timeout_ms=50)
 """
 
 from __future__ import annotations
 
+import dataclasses
+import functools
 import json
 import logging
+import os
+import tempfile
 import threading
 import time
 from datetime import datetime, timezone
@@ -29,6 +39,11 @@ from typing import Any
 
 import zmq
 
+try:
+    import orjson
+except ImportError:  # optional — stdlib json is used when unavailable
+    orjson = None
+
 # ---------------------------------------------------------------------------
 # Port constants — one per pipeline stage
 # ---------------------------------------------------------------------------
@@ -48,12 +63,142 @@ TACTIC_PORT: int = 5558
 SYSTEM_PORT: int = 5559
 """System metrics (CPU, RAM, GPU, power, pipeline latency) from system_monitor."""
 
+# ---------------------------------------------------------------------------
+# Transport — how a port number becomes a ZeroMQ endpoint
+# ---------------------------------------------------------------------------
+
+TRANSPORTS: tuple[str, ...] = ("tcp", "ipc", "inproc")
+
+TRANSPORT: str = os.environ.get("ANCHOR_TRANSPORT", "tcp")
+"""Default transport for bus sockets, from the ``ANCHOR_TRANSPORT`` env var.
+
+``"tcp"`` binds loopback ports.  ``"ipc"`` maps each port to a Unix domain
+socket, which skips the kernel TCP stack between the pipeline's processes.
+``"inproc"`` only reaches sockets in the same process (one shared context),
+e.g. stages run together in a test.  Every process of one pipeline must use
+the same transport.
+"""
+
+
+def _endpoint(port: int, transport: str) -> str:
+    """ZeroMQ endpoint for pipeline *port* over *transport*."""
+    if transport == "tcp":
+        return f"tcp://127.0.0.1:{port}"
+    if transport == "ipc":
+        return f"ipc://{os.path.join(tempfile.gettempdir(), f'anchor-{port}')}"
+    if transport == "inproc":
+        return f"inproc://anchor-{port}"
+    raise ValueError(f"Unknown transport {transport!r}; expected one of {TRANSPORTS}")
+
+
+# ---------------------------------------------------------------------------
+# Socket tuning — applied to every socket created by MessageBus
+# ---------------------------------------------------------------------------
+
+SOCKET_HWM: int = 1000
+"""Default per-socket send/receive high-water mark (messages queued per peer).
+
+Callers can pass their own ``hwm`` to the socket factories: deeper for
+small text messages that must not drop, :data:`AUDIO_HWM` for the audio
+stream.
+"""
+
+AUDIO_HWM: int = 50
+"""High-water mark for the audio stream's PUB and SUB sockets.
+
+About 3 s of default 1024-sample chunks at 16 kHz.  It bounds the socket
+queues only: the audio consumers drain their subscriber continuously and
+hand inference to a worker thread, so backlog builds in their own buffers
+instead.  Each caps that buffer itself (SpeechRecognizer keeps the newest
+30 s, StressDetector the newest few windows), dropping the oldest audio.
+"""
+
+IO_THREADS: int = 2
+"""Background I/O threads in the process-wide ``zmq.Context``.
+
+One thread serialises all socket I/O in a process; two lets a stage's
+publishers and subscriber progress independently without oversubscribing
+the Jetson's cores across the pipeline's processes.
+"""
+
+PUB_LINGER_MS: int = 100
+"""Upper bound on how long a closing PUB socket keeps flushing queued messages.
+
+Bounded (rather than libzmq's infinite default) so shutdown never hangs,
+but non-zero so a ``publish()`` immediately followed by ``close()`` is
+still delivered.
+"""
+
 # ---------------------------------------------------------------------------
 # Module-level logger
 # ---------------------------------------------------------------------------
 
 logger = logging.getLogger(__name__)
 
+# ---------------------------------------------------------------------------
+# Envelope (de)serialisation
+# ---------------------------------------------------------------------------
+
+def _json_default(obj: Any) -> Any:
+    """stdlib ``json`` hook for the types orjson encodes natively."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _ORJSON_OPTS: int = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def _dumps(obj: Any) -> bytes:
+        """Encode *obj* straight to UTF-8 JSON bytes (numpy values, datetimes and
+        dataclasses allowed)."""
+        return orjson.dumps(obj, option=_ORJSON_OPTS)
+
+    def _loads(buf: bytes) -> Any:
+        return orjson.loads(buf)
+
+else:
+
+    def _dumps(obj: Any) -> bytes:
+        """Encode *obj* to UTF-8 JSON bytes (datetimes and dataclasses allowed)."""
+        return json.dumps(obj, default=_json_default).encode("utf-8")
+
+    def _loads(buf: bytes) -> Any:
+        return json.loads(buf)
+
+
+# Topics are a handful of fixed names, so each one is converted between
+# str and its frame bytes once rather than on every message.
+@functools.lru_cache(maxsize=64)
+def _topic_frame(topic: str) -> bytes:
+    return topic.encode("utf-8")
+
+
+@functools.lru_cache(maxsize=64)
+def _topic_name(frame: bytes) -> str:
+    return frame.decode("utf-8")
+
+
+def _set_rcvtimeo(socket: zmq.Socket, timeout_ms: int) -> None:
+    """Make blocking receives on *socket* time out after *timeout_ms*.
+
+    A blocking ``recv`` bounded by ZMQ_RCVTIMEO replaces building a
+    ``zmq.Poller`` per call; the option is only rewritten when it changes.
+    """
+    if socket.getsockopt(zmq.RCVTIMEO) != timeout_ms:
+        socket.setsockopt(zmq.RCVTIMEO, timeout_ms)
+
+
+def _unpack(frames: list[bytes]) -> tuple[str, dict[str, Any]]:
+    """``(topic, envelope)`` from received frames; a third frame, if any,
+    is attached to the envelope as ``"binary"``."""
+    message: dict[str, Any] = _loads(frames[1])
+    if len(frames) > 2:
+        message["binary"] = frames[2]
+    return _topic_name(frames[0]), message
+
 
 class MessageBus:
     """Thin wrapper around ZeroMQ PUB/SUB for inter-stage communication.
@@ -90,19 +235,35 @@ class MessageBus:
             with cls._lock:
                 # Double-checked locking.
                 if cls._context is None:
-                    cls._context = zmq.Context()
-                    logger.debug("Created new zmq.Context")
+                    cls._context = zmq.Context(io_threads=IO_THREADS)
+                    logger.debug("Created new zmq.Context (%d I/O threads)", IO_THREADS)
         return cls._context
 
     # -- Socket factories ----------------------------------------------------
 
-    def create_publisher(self, port: int) -> zmq.Socket:
-        """Create and bind a PUB socket on *port* (TCP, localhost).
+    def create_publisher(
+        self,
+        port: int,
+        hwm: int = SOCKET_HWM,
+        transport: str | None = None,
+    ) -> zmq.Socket:
+        """Create and bind a PUB socket on *port* (TCP, localhost, by default).
+
+        The send queue is capped at *hwm* messages and close
+        lingers at most :data:`PUB_LINGER_MS`.  Nagle is already disabled
+        by libzmq on every TCP connection, so small messages go out
+        immediately.
 
         Parameters
         ----------
         port:
-            TCP port number to ``bind`` to on ``127.0.0.1``.
+            TCP port number to ``bind`` to on ``127.0.0.1`` (or the port's
+            ipc/inproc endpoint).
+        hwm:
+            Send high-water mark; messages beyond it are dropped.
+        transport:
+            ``"tcp"``, ``"ipc"`` or ``"inproc"``; defaults to
+            :data:`TRANSPORT`.
 
         Returns
         -------
@@ -110,17 +271,28 @@ class MessageBus:
             A bound ``zmq.PUB`` socket ready for :meth:`publish`.
         """
         socket: zmq.Socket = self.context.socket(zmq.PUB)
-        socket.bind(f"tcp://127.0.0.1:{port}")
-        logger.info("PUB socket bound on port %d", port)
+        socket.setsockopt(zmq.SNDHWM, hwm)
+        socket.setsockopt(zmq.LINGER, PUB_LINGER_MS)
+        # ZMQ_IMMEDIATE only affects connecting sockets, and TCP keepalive
+        # guards against idle NAT/firewall drops that loopback never sees,
+        # so neither is set on this bound socket.
+        endpoint = _endpoint(port, transport or TRANSPORT)
+        socket.bind(endpoint)
+        logger.info("PUB socket bound on %s", endpoint)
         return socket
 
     def create_subscriber(
         self,
         ports: list[int],
         topics: list[str] | None = None,
+        hwm: int = SOCKET_HWM,
+        transport: str | None = None,
     ) -> zmq.Socket:
         """Create a SUB socket connected to one or more publisher *ports*.
 
+        The receive queue is capped at *hwm* messages and
+        close never lingers (a subscriber has nothing worth flushing).
+
         Parameters
         ----------
         ports:
@@ -128,6 +300,11 @@ class MessageBus:
         topics:
             Topic strings to subscribe to.  An empty string (``""``)
             subscribes to **all** topics — this is the default.
+        hwm:
+            Receive high-water mark; messages beyond it are dropped.
+        transport:
+            ``"tcp"``, ``"ipc"`` or ``"inproc"``; defaults to
+            :data:`TRANSPORT`.  Must match the publishers'.
 
         Returns
         -------
@@ -138,9 +315,14 @@ class MessageBus:
             topics = [""]
 
         socket: zmq.Socket = self.context.socket(zmq.SUB)
+        socket.setsockopt(zmq.RCVHWM, hwm)
+        socket.setsockopt(zmq.LINGER, 0)
+        # ZMQ_IMMEDIATE is deliberately not set: on a SUB socket it stops
+        # the subscription from reaching publishers that connect late.
         for port in ports:
-            socket.connect(f"tcp://127.0.0.1:{port}")
-            logger.debug("SUB socket connected to port %d", port)
+            endpoint = _endpoint(port, transport or TRANSPORT)
+            socket.connect(endpoint)
+            logger.debug("SUB socket connected to %s", endpoint)
 
         for topic in topics:
             socket.setsockopt_string(zmq.SUBSCRIBE, topic)
@@ -153,7 +335,14 @@ class MessageBus:
 
     # -- Publish / Receive ---------------------------------------------------
 
-    def publish(self, socket: zmq.Socket, topic: str, data: dict[str, Any]) -> None:
+    def publish(
+        self,
+        socket: zmq.Socket,
+        topic: str,
+        data: Any,
+        timestamp: str | datetime | None = None,
+        binary: bytes | memoryview | None = None,
+    ) -> None:
         """Publish a message on *socket* under *topic*.
 
         The message is sent as two ZeroMQ frames:
@@ -162,6 +351,8 @@ class MessageBus:
         2. **Body frame** — JSON-encoded envelope containing ``timestamp``,
            ``topic``, and ``data``.
 
+        followed by a third, raw frame when *binary* is given.
+
         Parameters
         ----------
         socket:
@@ -169,18 +360,32 @@ class MessageBus:
         topic:
             Routing topic (e.g. ``"audio"``, ``"stress"``).
         data:
-            Arbitrary JSON-serialisable payload dict.
+            JSON-serialisable payload: a dict, or a dataclass instance
+            (encoded as a dict of its fields).
+        timestamp:
+            Envelope timestamp, as an ISO 8601 string or an aware
+            ``datetime`` (formatted by the encoder).  Defaults to now; pass
+            one in when the payload already carries the same instant.
+        binary:
+            Optional bytes-like payload sent verbatim as a third frame.
         """
         envelope: dict[str, Any] = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            # A datetime is formatted by the encoder (in C with orjson), to
+            # the same ISO 8601 string isoformat() would produce.
+            "timestamp": timestamp or datetime.now(timezone.utc),
             "topic": topic,
             "data": data,
         }
-        payload: str = json.dumps(envelope)
-        socket.send_multipart(
-            [topic.encode("utf-8"), payload.encode("utf-8")]
-        )
-        logger.debug("Published [%s]: %s", topic, payload[:120])
+        payload: bytes = _dumps(envelope)
+        # copy=False: pyzmq still copies frames under zmq.COPY_THRESHOLD
+        # (64 KiB) and hands larger bodies to libzmq without a copy.  PUB
+        # sends never block — past SNDHWM libzmq drops — so no DONTWAIT.
+        frames: list[Any] = [_topic_frame(topic), payload]
+        if binary is not None:
+            frames.append(binary)
+        socket.send_multipart(frames, copy=False)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Published [%s]: %s", topic, payload[:120].decode("utf-8", "replace"))
 
     def receive(
         self,
@@ -200,18 +405,55 @@ class MessageBus:
         -------
         tuple[str, dict] | None
             ``(topic, envelope_dict)`` on success, or ``None`` on timeout.
+            A binary frame, if sent, is under ``envelope_dict["binary"]``.
         """
-        poller = zmq.Poller()
-        poller.register(socket, zmq.POLLIN)
-
-        events = dict(poller.poll(timeout=timeout_ms))
-        if socket not in events:
+        _set_rcvtimeo(socket, timeout_ms)
+        try:
+            return _unpack(socket.recv_multipart())
+        except zmq.Again:
             return None
 
-        frames: list[bytes] = socket.recv_multipart()
-        topic: str = frames[0].decode("utf-8")
-        message: dict[str, Any] = json.loads(frames[1].decode("utf-8"))
-        return topic, message
+    def drain(
+        self,
+        socket: zmq.Socket,
+        timeout_ms: int = 50,
+        max_messages: int = 1000,
+    ) -> list[tuple[str, dict[str, Any]]]:
+        """Wait up to *timeout_ms* for traffic, then read everything queued.
+
+        One timed, blocking read is followed by non-blocking reads until
+        the socket is empty (or *max_messages* have been read), so a burst
+        costs a single wake-up instead of one wait per message.
+
+        Parameters
+        ----------
+        socket:
+            A ``zmq.SUB`` socket obtained from :meth:`create_subscriber`.
+        timeout_ms:
+            Maximum time (milliseconds) to wait for the first message.
+        max_messages:
+            Upper bound on messages returned per call, so a flooding
+            publisher cannot starve the caller.
+
+        Returns
+        -------
+        list[tuple[str, dict]]
+            ``(topic, envelope_dict)`` pairs in arrival order; empty on
+            timeout.
+        """
+        messages: list[tuple[str, dict[str, Any]]] = []
+        _set_rcvtimeo(socket, timeout_ms)
+        try:
+            messages.append(_unpack(socket.recv_multipart()))
+        except zmq.Again:
+            return messages
+        while len(messages) < max_messages:
+            try:
+                frames: list[bytes] = socket.recv_multipart(flags=zmq.NOBLOCK)
+            except zmq.Again:
+                break
+            messages.append(_unpack(frames))
+        return messages
 
 
 # ---------------------------------------------------------------------------
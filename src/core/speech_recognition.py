@@ -1,9 +1,9 @@
 """Real-time GPU-accelerated speech recognition for the Anchor pipeline.
 
-Subscribes to base64-encoded int16 audio chunks on ``AUDIO_PORT`` (5555),
+Subscribes to raw int16 PCM audio chunks on ``AUDIO_PORT`` (5555),
 accumulates them until ``min_audio_length`` seconds are buffered, runs
 `faster-whisper <https://github.com/SYSTRAN/faster-whisper>`_ on the Jetson
-Orin Nano GPU (CUDA / float16), and publishes transcription results on
+Orin Nano GPU (CUDA / int8 weights, float16 activations), and publishes transcription results on
 ``TRANSCRIPT_PORT`` (5556).
 
 Architecture
@@ -12,7 +12,7 @@ Architecture
 
     ┌───────────┐  SUB :5555   ┌──────────────┐  PUB :5556   ┌──────────┐
     │ audio_    │ ───────────→ │ Speech       │ ───────────→ │ stress / │
-    │ capture   │  base64 int16│ Recognizer   │  transcript  │ tactic   │
+    │ capture   │  int16 PCM   │ Recognizer   │  transcript  │ tactic   │
     └───────────┘              │  (Whisper)   │              └──────────┘
                                └──────────────┘
 
@@ -33,14 +33,15 @@ Usage::
     bus = MessageBus()
     asr = SpeechRecognizer(config=ASRConfig(), bus=bus)
     asr.start()   # blocking – call asr.stop() from another thread
+    asr.close()   # once done with the recognizer
 """
 
 from __future__ import annotations
 
-import base64
 import logging
 import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any
@@ -49,7 +50,7 @@ import numpy as np
 import zmq
 from faster_whisper import WhisperModel
 
-from src.core.message_bus import AUDIO_PORT, TRANSCRIPT_PORT, MessageBus
+from src.core.message_bus import AUDIO_HWM, AUDIO_PORT, TRANSCRIPT_PORT, MessageBus
 
 # ---------------------------------------------------------------------------
 # Module-level logger
@@ -57,6 +58,16 @@ from src.core.message_bus import AUDIO_PORT, TRANSCRIPT_PORT, MessageBus
 
 logger = logging.getLogger(__name__)
 
+_BUFFER_CAPACITY_S: int = 30
+"""Most seconds of audio held for the next window (Whisper's own limit).
+
+Audio arriving while a slow transcription runs piles up here; past this
+the oldest samples are dropped, so latency and memory stay bounded.
+"""
+
+_PCM_SCALE = np.float32(1.0 / 32768.0)
+"""int16 full scale → [-1.0, 1.0); a power of two, so exact."""
+
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
@@ -79,11 +90,21 @@ class ASRConfig:
         Minimum seconds of audio to buffer before invoking Whisper.
         Shorter values give faster feedback but may reduce accuracy.
         Default 2.5 s improves coherence by avoiding mid-word chunk cuts.
+    compute_type:
+        CTranslate2 compute type.  ``"int8_float16"`` stores int8 weights
+        with float16 activations, halving the weight bytes the decoder
+        streams per step; use ``"float16"`` for full-precision weights.
+    silence_rms:
+        Windows whose RMS (before normalisation) falls below this are
+        treated as silence and never reach Whisper.  ``0.005`` is about
+        -46 dBFS; set to ``0`` to transcribe everything.
     """
 
     model_size: str = "small"
     language: str = "en"
     min_audio_length: float = 2.5
+    compute_type: str = "int8_float16"
+    silence_rms: float = 0.005
 
 
 # ---------------------------------------------------------------------------
@@ -113,26 +134,40 @@ class SpeechRecognizer:
         self.config: ASRConfig = config
         self.bus: MessageBus = bus
 
-        # Audio buffer — flat list of float32 samples at 16 kHz.
-        self._buffer: list[float] = []
         self._sample_rate: int = 16000  # updated from first received chunk
+        # Audio buffer — preallocated float32 samples; the first
+        # ``_buffered`` are valid.  Grown only if a stall overfills it.
+        # Two of them swap on each flush, so the flushed window can be
+        # handed out as a view while the other one fills.
+        self._buffer: np.ndarray = np.empty(
+            self._sample_rate * _BUFFER_CAPACITY_S, dtype=np.float32,
+        )
+        self._spare: np.ndarray = np.empty_like(self._buffer)
+        self._buffered: int = 0
+        self._overflowing: bool = False  # dropping backlog; logged once per window
+        self._warned_no_pcm: bool = False  # PCM-less audio message already logged
 
         self._stop_event: threading.Event = threading.Event()
         self._publisher: zmq.Socket | None = None
         self._subscriber: zmq.Socket | None = None
+        # Whisper runs here so the main loop keeps receiving (and decoding
+        # into the buffer) while a window is on the GPU.  After start() the
+        # worker is the only thread that touches the publisher.
+        self._transcribe_exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper")
+        self._inflight: Future[None] | None = None  # window being transcribed, if any
 
         self.running: bool = False
 
         # Load the model eagerly so callers get an immediate error if
         # CUDA / model files are unavailable.
         logger.info(
-            "Loading Whisper model: size=%s, device=cuda, compute_type=float16",
-            config.model_size,
+            "Loading Whisper model: size=%s, device=cuda, compute_type=%s",
+            config.model_size, config.compute_type,
         )
         self._model: WhisperModel = WhisperModel(
             config.model_size,
             device="cuda",
-            compute_type="float16",
+            compute_type=config.compute_type,
         )
         logger.info("Whisper model loaded successfully")
 
@@ -141,7 +176,7 @@ class SpeechRecognizer:
     @property
     def buffer_seconds(self) -> float:
         """Duration of audio currently in the buffer (seconds)."""
-        return len(self._buffer) / self._sample_rate
+        return self._buffered / self._sample_rate
 
     # -- Audio decoding ------------------------------------------------------
 
@@ -170,28 +205,26 @@ class SpeechRecognizer:
         return audio
 
     @staticmethod
-    def _decode_audio(data: dict[str, Any]) -> np.ndarray:
-        """Decode a base64-encoded int16 audio payload to float32.
+    def _decode_audio(pcm: bytes, out: np.ndarray | None = None) -> np.ndarray:
+        """Convert a little-endian int16 PCM chunk to float32.
 
-        The audio_capture module publishes samples as base64-encoded
-        little-endian int16 PCM.  This method reverses that encoding and
-        normalises to the [-1.0, 1.0] range expected by Whisper.
+        The cast and scale run as one NumPy loop, writing the output once.
 
         Parameters
         ----------
-        data:
-            The ``data`` dict from an audio bus message.  Must contain a
-            ``"samples"`` key with a base64-encoded string.
+        pcm:
+            The binary frame of an audio bus message
+            (``envelope["binary"]``), as published by audio_capture.
+        out:
+            Optional float32 array of matching length to decode into.
 
         Returns
         -------
         np.ndarray
             1-D float32 array normalised to [-1.0, 1.0].
         """
-        raw_bytes: bytes = base64.b64decode(data["samples"])
-        int16_samples: np.ndarray = np.frombuffer(raw_bytes, dtype=np.int16)
-        float32_samples: np.ndarray = int16_samples.astype(np.float32) / 32768.0
-        return float32_samples
+        int16_samples: np.ndarray = np.frombuffer(pcm, dtype=np.int16)
+        return np.multiply(int16_samples, _PCM_SCALE, out=out, dtype=np.float32)
 
     # -- Transcription -------------------------------------------------------
 
@@ -208,6 +241,11 @@ class SpeechRecognizer:
         dict
             ``{"text": str, "segments": list[dict], "language": str}``
         """
+        # Energy gate: a silent window yields the same empty transcript
+        # Whisper would produce, without the GPU pass.
+        if len(audio) == 0 or np.sqrt(np.dot(audio, audio) / len(audio)) < self.config.silence_rms:
+            return {"text": "", "segments": [], "language": self.config.language}
+
         audio = self._normalize_audio(audio)
 
         segments_iter, info = self._model.transcribe(
@@ -224,12 +262,14 @@ class SpeechRecognizer:
             ),
         )
 
-        # Materialise the segment generator.
-        segments: list[dict[str, Any]] = [
-            {"start": seg.start, "end": seg.end, "text": seg.text}
-            for seg in segments_iter
-        ]
-        full_text: str = "".join(seg["text"] for seg in segments).strip()
+        # Materialise the segment generator, collecting the text in the
+        # same pass.
+        segments: list[dict[str, Any]] = []
+        texts: list[str] = []
+        for seg in segments_iter:
+            segments.append({"start": seg.start, "end": seg.end, "text": seg.text})
+            texts.append(seg.text)
+        full_text: str = "".join(texts).strip()
 
         return {
             "text": full_text,
@@ -243,10 +283,46 @@ class SpeechRecognizer:
         """Return ``True`` when the buffer has enough audio to transcribe."""
         return self.buffer_seconds >= self.config.min_audio_length
 
+    def _reserve(self, n: int) -> np.ndarray:
+        """Extend the buffer by *n* samples and return them as a view to fill.
+
+        Holds at most :data:`_BUFFER_CAPACITY_S` seconds; beyond that the
+        oldest buffered samples are dropped to make room.
+        """
+        start = self._buffered
+        excess = min(start + n - self._sample_rate * _BUFFER_CAPACITY_S, start)
+        if excess > 0:
+            if not self._overflowing:
+                self._overflowing = True
+                logger.warning(
+                    "[SPEECH] Transcription behind real time; dropping oldest audio "
+                    "beyond %ds", _BUFFER_CAPACITY_S,
+                )
+            self._buffer[:start - excess] = self._buffer[excess:start]
+            start -= excess
+        end = start + n
+        if end > len(self._buffer):
+            grown = np.empty(max(end, 2 * len(self._buffer)), dtype=np.float32)
+            grown[:start] = self._buffer[:start]
+            self._buffer = grown
+        self._buffered = end
+        return self._buffer[start:end]
+
+    def _append(self, chunk: np.ndarray) -> None:
+        """Copy float32 *chunk* onto the end of the buffer."""
+        self._reserve(len(chunk))[:] = chunk
+
     def _flush_buffer(self) -> np.ndarray:
-        """Return the buffered audio as a NumPy array and clear the buffer."""
-        audio = np.array(self._buffer, dtype=np.float32)
-        self._buffer.clear()
+        """Return the buffered audio as a view and start filling the spare.
+
+        The view stays valid until the flush after next, which the main
+        loop only performs once the window it was given has been
+        transcribed.
+        """
+        audio = self._buffer[:self._buffered]
+        self._buffer, self._spare = self._spare, self._buffer
+        self._buffered = 0
+        self._overflowing = False
         return audio
 
     # -- Lifecycle -----------------------------------------------------------
@@ -260,7 +336,7 @@ class SpeechRecognizer:
 
         if self._subscriber is None:
             self._subscriber = self.bus.create_subscriber(
-                ports=[AUDIO_PORT], topics=["audio"],
+                ports=[AUDIO_PORT], topics=["audio"], hwm=AUDIO_HWM,
             )
         if self._publisher is None:
             self._publisher = self.bus.create_publisher(TRANSCRIPT_PORT)
@@ -275,6 +351,10 @@ class SpeechRecognizer:
         try:
             self._main_loop()
         finally:
+            # Let an in-flight window finish and publish before returning.
+            # The worker stays up so start() can run again; close() ends it.
+            if self._inflight is not None:
+                wait([self._inflight])
             self.running = False
             logger.info("SpeechRecognizer stopped")
 
@@ -284,6 +364,10 @@ class SpeechRecognizer:
         self.running = False
         logger.info("SpeechRecognizer stop signal sent")
 
+    def close(self) -> None:
+        """Shut down the transcription worker.  Call after the last :meth:`start`."""
+        self._transcribe_exec.shutdown(wait=True)
+
     # -- Main loop -----------------------------------------------------------
 
     def _main_loop(self) -> None:
@@ -296,43 +380,65 @@ class SpeechRecognizer:
             _, envelope = result
             data: dict[str, Any] = envelope["data"]
 
+            # Samples travel in the binary frame; a two-frame message comes
+            # from an older publisher (base64 JSON) and carries none.
+            pcm: bytes | None = envelope.get("binary")
+            if pcm is None:
+                if not self._warned_no_pcm:
+                    self._warned_no_pcm = True
+                    logger.warning("[SPEECH] Skipping audio messages without a PCM frame")
+                continue
+
             # Update sample rate from the source (in case it differs).
             self._sample_rate = int(data.get("sample_rate", self._sample_rate))
 
-            # Decode and accumulate.
-            chunk: np.ndarray = self._decode_audio(data)
-            self._buffer.extend(chunk.tolist())
+            # Decode straight into the buffer.
+            self._decode_audio(pcm, out=self._reserve(len(pcm) // 2))
 
-            # Transcribe when we have enough audio.
-            if self._buffer_ready():
-                audio = self._flush_buffer()
-                chunk_count = int(len(audio) / (self._sample_rate * 0.1))  # ~10 chunks/sec
+            # Transcribe when we have enough audio and the previous window
+            # is done; until then keep buffering, so intake never stalls.
+            if self._buffer_ready() and (self._inflight is None or self._inflight.done()):
+                self._inflight = self._transcribe_exec.submit(
+                    self._transcribe_and_publish, self._flush_buffer(),
+                )
 
-                t_start = time.perf_counter()
-                transcript = self._transcribe(audio)
-                latency_ms = (time.perf_counter() - t_start) * 1000.0
+    def _transcribe_and_publish(self, audio: np.ndarray) -> None:
+        """Worker thread: transcribe one window and publish the transcript."""
+        chunk_count = int(len(audio) / (self._sample_rate * 0.1))  # ~10 chunks/sec
 
-                text = transcript["text"].strip() if transcript["text"] else ""
-                text_preview = (text[:80] + "…") if len(text) > 80 else text
-                text_preview = text_preview or "(silence)"
+        t_start = time.perf_counter()
+        try:
+            transcript = self._transcribe(audio)
+        except Exception:
+            logger.exception("[SPEECH] Transcription failed (%.2fs audio)", len(audio) / self._sample_rate)
+            return
+        latency_ms = (time.perf_counter() - t_start) * 1000.0
 
-                logger.info(
-                    "[SPEECH] Transcribed %.2fs audio in %.0fms: %s",
-                    len(audio) / self._sample_rate,
-                    latency_ms,
-                    text_preview,
-                )
-                logger.debug(
-                    "[SPEECH] [TRANSCRIBE] %r (from ~%d chunks)",
-                    text_preview, chunk_count,
-                )
+        text = transcript["text"].strip() if transcript["text"] else ""
+        text_preview = (text[:80] + "…") if len(text) > 80 else text
+        text_preview = text_preview or "(silence)"
+
+        logger.info(
+            "[SPEECH] Transcribed %.2fs audio in %.0fms: %s",
+            len(audio) / self._sample_rate,
+            latency_ms,
+            text_preview,
+        )
+        logger.debug(
+            "[SPEECH] [TRANSCRIBE] %r (from ~%d chunks)",
+            text_preview, chunk_count,
+        )
 
-                # Publish.
-                transcript["timestamp"] = datetime.now(timezone.utc).isoformat()
-                transcript["is_final"] = True  # Batch transcripts are always final (tactic_inference requires this)
-                transcript["inference_time_ms"] = round(latency_ms, 1)
-                self.bus.publish(self._publisher, topic="transcript", data=transcript)
-                logger.debug("[SPEECH] [PUBLISH] sent to port %d", TRANSCRIPT_PORT)
+        # Publish.
+        # One instant for payload and envelope; the encoder formats it.
+        now = datetime.now(timezone.utc)
+        transcript["timestamp"] = now
+        transcript["is_final"] = True  # Batch transcripts are always final (tactic_inference requires this)
+        transcript["inference_time_ms"] = round(latency_ms, 1)
+        self.bus.publish(
+            self._publisher, topic="transcript", data=transcript, timestamp=now,
+        )
+        logger.debug("[SPEECH] [PUBLISH] sent to port %d", TRANSCRIPT_PORT)
 
 
 # ---------------------------------------------------------------------------
@@ -420,6 +526,7 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         asr.stop()
 
+    asr.close()
     display_thread.join(timeout=5)
     transcript_sub.close()
     print("\nSmoke test complete.")
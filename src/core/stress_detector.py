@@ -1,6 +1,6 @@
 """GPU-accelerated vocal-stress detection for the Anchor pipeline.
 
-Subscribes to base64-encoded int16 audio chunks on ``AUDIO_PORT`` (5555),
+Subscribes to raw int16 PCM audio chunks on ``AUDIO_PORT`` (5555),
 accumulates them into 2–3 second windows, runs the
 `audeering/wav2vec2-large-robust-12-ft-emotion-msp-dim
 <https://huggingface.co/audeering/wav2vec2-large-robust-12-ft-emotion-msp-dim>`_
@@ -39,7 +39,7 @@ Architecture
 
     ┌───────────┐  SUB :5555   ┌──────────────┐  PUB :5557   ┌──────────┐
     │ audio_    │ ───────────→ │ Stress       │ ───────────→ │ tactic / │
-    │ capture   │  base64 int16│ Detector     │  stress      │ viz      │
+    │ capture   │  int16 PCM   │ Detector     │  stress      │ viz      │
     └───────────┘              │  (wav2vec2)  │              └──────────┘
                                └──────────────┘
 
@@ -64,17 +64,18 @@ Usage::
     bus = MessageBus()
     detector = StressDetector(config=StressConfig(), bus=bus)
     detector.start()   # blocking – call detector.stop() from another thread
+    detector.close()   # once done with the detector
 """
 
 from __future__ import annotations
 
-import base64
 import logging
 import os
 import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
 # ---------------------------------------------------------------------------
@@ -98,6 +99,14 @@ try:
 except (ImportError, OSError):
     pass  # cusparselt not installed or not needed
 
+# Cap the caching allocator's block splitting so one-off loader and
+# preprocessing tensors don't fragment the Jetson's shared memory.  Read
+# when CUDA initialises, so it only applies if torch hasn't used the GPU
+# yet; an explicit setting in the environment wins.
+os.environ.setdefault(
+    "PYTORCH_CUDA_ALLOC_CONF", "max_split_size_mb:128,expandable_segments:True",
+)
+
 import numpy as np
 import torch
 import torch.nn as nn
@@ -108,7 +117,7 @@ from transformers.models.wav2vec2.modeling_wav2vec2 import (
     Wav2Vec2PreTrainedModel,
 )
 
-from src.core.message_bus import AUDIO_PORT, STRESS_PORT, MessageBus
+from src.core.message_bus import AUDIO_HWM, AUDIO_PORT, STRESS_PORT, MessageBus
 
 # ---------------------------------------------------------------------------
 # Module-level logger
@@ -123,6 +132,19 @@ logger = logging.getLogger(__name__)
 _MODEL_NAME: str = "audeering/wav2vec2-large-robust-12-ft-emotion-msp-dim"
 """HuggingFace model identifier for the dimensional emotion model."""
 
+_BUFFER_CAPACITY_S: int = 30
+"""Seconds of audio the receive buffer holds before it has to grow."""
+
+_PCM_SCALE = np.float32(1.0 / 32_768.0)
+"""int16 full scale → [-1.0, 1.0); a power of two, so exact."""
+
+_MAX_BATCH: int = 4
+"""Most backlogged windows analysed together in one forward pass.
+
+Also the most audio kept while inference is behind: stress is a live
+signal, so anything older than the newest ``_MAX_BATCH`` windows is dropped.
+"""
+
 
 class _RegressionHead(nn.Module):
     """MLP regression head mapping pooled hidden states to emotion dims.
@@ -185,15 +207,28 @@ class StressConfig:
     model_name:
         HuggingFace model identifier.
     min_audio_length:
-        Minimum seconds of audio to buffer before running inference.
-        2–3 s gives a good trade-off between latency and accuracy.
+        Seconds of audio per inference window.  2–3 s gives a good
+        trade-off between latency and accuracy.
     device:
         PyTorch device string (``"cuda"`` or ``"cpu"``).
+    half_precision:
+        Run the model in float16 on CUDA, halving the weight and
+        activation bytes the encoder moves.  Ignored on CPU.
+    quantize_cpu:
+        On the CPU fallback, swap the encoder's ``nn.Linear`` layers for
+        dynamically quantised int8 ones.  Ignored on CUDA.
+    cuda_graph:
+        Capture the forward pass for the fixed window length as a CUDA
+        graph on first use and replay it, so each window costs one launch
+        instead of one per kernel.  Falls back to eager if capture fails.
     """
 
     model_name: str = _MODEL_NAME
     min_audio_length: float = 2.5
     device: str = "cuda"
+    half_precision: bool = True
+    quantize_cpu: bool = True
+    cuda_graph: bool = True
 
 
 # ---------------------------------------------------------------------------
@@ -222,13 +257,26 @@ class StressDetector:
         self.config: StressConfig = config
         self.bus: MessageBus = bus
 
-        # Audio buffer — flat list of float32 samples at 16 kHz.
-        self._buffer: list[float] = []
-        self._sample_rate: int = 16_000
+        self._sample_rate: int = 16_000  # set to the model's rate once loaded
+        self._rejected_rates: set[str] = set()  # mismatched rates already warned about
+        self._warned_no_pcm: bool = False  # PCM-less audio message already logged
+        # Audio buffer — preallocated float32 samples; the first
+        # ``_buffered`` are valid.  Grown only if a stall overfills it.
+        self._buffer: np.ndarray = np.empty(
+            self._sample_rate * _BUFFER_CAPACITY_S, dtype=np.float32,
+        )
+        self._buffered: int = 0
+        self._overflowing: bool = False  # dropping backlog; logged once per flush
 
         self._stop_event: threading.Event = threading.Event()
         self._publisher: zmq.Socket | None = None
         self._subscriber: zmq.Socket | None = None
+        # Inference runs here so the main loop keeps receiving while a
+        # window is on the GPU.  After start() the worker is the only
+        # thread that touches the publisher, the CUDA graph and the
+        # pinned staging tensor.
+        self._predict_exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wav2vec2")
+        self._inflight: Future[None] | None = None  # window being analysed, if any
 
         self.running: bool = False
 
@@ -241,40 +289,80 @@ class StressDetector:
         self._processor: Wav2Vec2Processor = Wav2Vec2Processor.from_pretrained(
             config.model_name,
         )
+        # _predict_emotions applies the feature extractor's normalisation
+        # itself; only this flag is read from the processor.
+        self._do_normalize: bool = bool(self._processor.feature_extractor.do_normalize)
+        # The model only understands audio at the rate it was trained on
+        # (16 kHz); chunks at any other rate are rejected in _main_loop.
+        self._sample_rate = int(self._processor.feature_extractor.sampling_rate)
         self._model: _EmotionModel = _EmotionModel.from_pretrained(
             config.model_name,
         ).to(config.device)  # type: ignore[arg-type]
         self._model.eval()
-        logger.info("Emotion model loaded successfully on %s", config.device)
+        # Inference only: no parameter ever needs a gradient.
+        self._model.requires_grad_(False)
+        self._dtype: torch.dtype = torch.float32
+        if config.device.startswith("cuda"):
+            if config.half_precision:
+                self._dtype = torch.float16
+                self._model.half()
+        elif config.quantize_cpu:
+            # int8 GEMMs for the attention/FFN projections, which dominate
+            # a float32 CPU forward; activations stay float32.
+            self._model = torch.ao.quantization.quantize_dynamic(
+                self._model, {nn.Linear}, dtype=torch.qint8,
+            )
+        if config.device.startswith("cuda"):
+            # Hand back the loader's staging blocks before inference starts.
+            torch.cuda.empty_cache()
+        logger.info(
+            "Emotion model loaded successfully on %s (%s)", config.device, self._dtype,
+        )
+
+        # CUDA graphs keyed by batch size, captured lazily by _graph_for();
+        # each holds the static input and logits tensors it reads and writes.
+        self._graphs: dict[int, tuple[torch.cuda.CUDAGraph, torch.Tensor, torch.Tensor]] = {}
+        # Memory pool of the first capture, shared by the later ones.
+        self._graph_pool: tuple[int, int] | None = None
+        self._use_graph: bool = config.cuda_graph and config.device.startswith("cuda")
+        # Page-locked staging for host→device input copies (CUDA only).
+        self._pinned: torch.Tensor | None = None
 
     # -- Public properties ---------------------------------------------------
 
     @property
     def buffer_seconds(self) -> float:
         """Duration of audio currently in the buffer (seconds)."""
-        return len(self._buffer) / self._sample_rate
+        return self._buffered / self._sample_rate
+
+    @property
+    def window_samples(self) -> int:
+        """Samples per inference window at the current sample rate."""
+        return int(self._sample_rate * self.config.min_audio_length)
 
     # -- Audio decoding (mirrors speech_recognition.py) ----------------------
 
     @staticmethod
-    def _decode_audio(data: dict[str, Any]) -> np.ndarray:
-        """Decode a base64-encoded int16 audio payload to float32.
+    def _decode_audio(pcm: bytes, out: np.ndarray | None = None) -> np.ndarray:
+        """Convert a little-endian int16 PCM chunk to float32.
+
+        The cast and scale run as one NumPy loop, writing the output once.
 
         Parameters
         ----------
-        data:
-            The ``data`` dict from an audio bus message.  Must contain a
-            ``"samples"`` key with a base64-encoded string.
+        pcm:
+            The binary frame of an audio bus message
+            (``envelope["binary"]``), as published by audio_capture.
+        out:
+            Optional float32 array of matching length to decode into.
 
         Returns
         -------
         np.ndarray
             1-D float32 array normalised to [-1.0, 1.0].
         """
-        raw_bytes: bytes = base64.b64decode(data["samples"])
-        int16_samples: np.ndarray = np.frombuffer(raw_bytes, dtype=np.int16)
-        float32_samples: np.ndarray = int16_samples.astype(np.float32) / 32_768.0
-        return float32_samples
+        int16_samples: np.ndarray = np.frombuffer(pcm, dtype=np.int16)
+        return np.multiply(int16_samples, _PCM_SCALE, out=out, dtype=np.float32)
 
     # -- Inference -----------------------------------------------------------
 
@@ -292,41 +380,140 @@ class StressDetector:
             ``{"arousal": float, "dominance": float, "valence": float,
               "confidence": float}``
         """
-        # Processor normalises the signal; returns a batch (take first item).
-        inputs = self._processor(
-            audio,
-            sampling_rate=self._sample_rate,
-            return_tensors="pt",
-        )
-        input_values: torch.Tensor = inputs["input_values"].to(self.config.device)
+        return self._predict_batch(np.asarray(audio, dtype=np.float32)[np.newaxis])[0]
 
-        with torch.no_grad():
-            _, logits = self._model(input_values)
+    def _predict_batch(self, windows: np.ndarray) -> list[dict[str, Any]]:
+        """Run emotion inference on equal-length *windows* in one forward.
 
-        # logits shape: (1, 3) → [arousal, dominance, valence]
-        scores: np.ndarray = logits.detach().cpu().numpy().flatten()
+        Parameters
+        ----------
+        windows:
+            2-D float32 array, one window per row.
+
+        Returns
+        -------
+        list[dict]
+            One :meth:`_predict_emotions` result per row, in order.
+        """
+        k, n = windows.shape
+        # On CUDA the input is written straight into pinned staging memory
+        # (through a NumPy view of it), ready for an async upload.
+        staged = self._staging(k, n)
+        if staged is not None:
+            buf: np.ndarray = staged.numpy()
+        elif self._do_normalize:
+            buf = np.empty_like(windows)
+        else:
+            buf = windows
+        # Same zero-mean / unit-variance step Wav2Vec2FeatureExtractor
+        # applies to each unpadded input, without the per-call batching
+        # and padding machinery.
+        if self._do_normalize:
+            mean = windows.mean(axis=1, keepdims=True)
+            var = windows.var(axis=1, keepdims=True)
+            np.subtract(windows, mean, out=buf)
+            buf /= np.sqrt(var + 1e-7)
+        elif buf is not windows:
+            buf[...] = windows
+        if staged is None:
+            staged = torch.from_numpy(buf)
+
+        # inference_mode also skips the version counters and view tracking
+        # that no_grad still maintains.
+        with torch.inference_mode():
+            captured = self._graph_for(k, n)
+            if captured is not None:
+                graph, static_input, static_logits = captured
+                static_input.copy_(staged, non_blocking=True)
+                graph.replay()
+                logits = static_logits
+            else:
+                _, logits = self._model(
+                    staged.to(self.config.device, dtype=self._dtype, non_blocking=True),
+                )
 
-        # Clip to [0, 1] — the model occasionally slightly exceeds bounds.
-        scores = np.clip(scores, 0.0, 1.0)
+        # logits shape: (k, 3) → [arousal, dominance, valence] per row.
+        # Clip to [0, 1] — the model occasionally slightly exceeds bounds —
+        # on the device, then read back as Python floats in one copy.
+        scores: list[list[float]] = logits.float().clamp(0.0, 1.0).tolist()
+
+        results: list[dict[str, Any]] = []
+        for arousal, dominance, valence in scores:
+            # Confidence heuristic: higher arousal + lower valence → higher
+            # confidence that stress is genuine (not just excitement).
+            confidence: float = min(max(
+                0.5 * arousal + 0.3 * (1.0 - valence) + 0.2 * (1.0 - dominance),
+                0.0,
+            ), 1.0)
+            results.append({
+                "arousal": arousal,
+                "dominance": dominance,
+                "valence": valence,
+                "confidence": confidence,
+            })
+        return results
+
+    def _staging(self, k: int, n: int) -> torch.Tensor | None:
+        """Return a pinned ``(k, n)`` host tensor to build model input in.
+
+        A page-locked source lets the upload run as one async DMA instead
+        of being staged through a driver bounce buffer.  The storage is
+        reused; that is safe because every batch ends by reading the
+        logits back, which waits for the previous copy.  ``None`` on CPU.
+        """
+        if not self.config.device.startswith("cuda"):
+            return None
+        if self._pinned is None or self._pinned.numel() < k * n:
+            self._pinned = torch.empty(
+                max(k * n, _MAX_BATCH * self.window_samples),
+                dtype=torch.float32, pin_memory=True,
+            )
+        return self._pinned[:k * n].view(k, n)
 
-        arousal: float = float(scores[0])
-        dominance: float = float(scores[1])
-        valence: float = float(scores[2])
+    def _graph_for(
+        self, k: int, n: int,
+    ) -> tuple[torch.cuda.CUDAGraph, torch.Tensor, torch.Tensor] | None:
+        """Return ``(graph, input, logits)`` for a *k*-window batch, or ``None``.
 
-        # Confidence heuristic: higher arousal + lower valence → higher
-        # confidence that stress is genuine (not just excitement).
-        confidence: float = float(np.clip(
-            0.5 * arousal + 0.3 * (1.0 - valence) + 0.2 * (1.0 - dominance),
-            0.0,
-            1.0,
-        ))
+        One graph is captured per batch size, for :attr:`window_samples`
+        windows, the first time such a batch arrives; other lengths always
+        run eagerly.  Must be called under ``torch.inference_mode()``.
 
-        return {
-            "arousal": arousal,
-            "dominance": dominance,
-            "valence": valence,
-            "confidence": confidence,
-        }
+        All graphs share one memory pool rather than each reserving its own
+        activations.  That is safe because they only replay one at a time on
+        the worker thread, and each graph's logits are read back before the
+        next replay.
+        """
+        if not self._use_graph or n != self.window_samples:
+            return None
+        captured = self._graphs.get(k)
+        if captured is not None and captured[1].shape[-1] == n:
+            return captured
+        try:
+            static_input = torch.zeros(k, n, device=self.config.device, dtype=self._dtype)
+            # Warm up on a side stream so lazy initialisation (cuDNN/cuBLAS
+            # handles, allocator pools) is not recorded into the graph.
+            stream = torch.cuda.Stream()
+            stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(stream):
+                for _ in range(3):
+                    self._model(static_input)
+            torch.cuda.current_stream().wait_stream(stream)
+
+            graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(graph, pool=self._graph_pool):
+                _, static_logits = self._model(static_input)
+            if self._graph_pool is None:
+                self._graph_pool = graph.pool()
+        except Exception:  # noqa: BLE001
+            logger.warning("CUDA graph capture failed; running eagerly", exc_info=True)
+            self._use_graph = False
+            return None
+
+        captured = (graph, static_input, static_logits)
+        self._graphs[k] = captured
+        logger.info("Captured CUDA graph for %d × %d-sample windows", k, n)
+        return captured
 
     # -- Buffer management ---------------------------------------------------
 
@@ -334,10 +521,42 @@ class StressDetector:
         """Return ``True`` when the buffer has enough audio to analyse."""
         return self.buffer_seconds >= self.config.min_audio_length
 
-    def _flush_buffer(self) -> np.ndarray:
-        """Return the buffered audio as a NumPy array and clear the buffer."""
-        audio = np.array(self._buffer, dtype=np.float32)
-        self._buffer.clear()
+    def _reserve(self, n: int) -> np.ndarray:
+        """Extend the buffer by *n* samples and return them as a view to fill.
+
+        Holds at most ``_MAX_BATCH`` windows; beyond that the oldest
+        buffered samples are dropped to make room.
+        """
+        start = self._buffered
+        excess = min(start + n - _MAX_BATCH * self.window_samples, start)
+        if excess > 0:
+            if not self._overflowing:
+                self._overflowing = True
+                logger.warning(
+                    "Inference behind real time; keeping only the newest %d windows",
+                    _MAX_BATCH,
+                )
+            self._buffer[:start - excess] = self._buffer[excess:start]
+            start -= excess
+        end = start + n
+        if end > len(self._buffer):
+            grown = np.empty(max(end, 2 * len(self._buffer)), dtype=np.float32)
+            grown[:start] = self._buffer[:start]
+            self._buffer = grown
+        self._buffered = end
+        return self._buffer[start:end]
+
+    def _flush_buffer(self, n: int | None = None) -> np.ndarray:
+        """Return the first *n* buffered samples (default: all) as a copy.
+
+        Samples past *n* stay buffered and start the next window.
+        """
+        n = self._buffered if n is None else min(n, self._buffered)
+        audio = self._buffer[:n].copy()
+        rest = self._buffered - n
+        self._buffer[:rest] = self._buffer[n:self._buffered]
+        self._buffered = rest
+        self._overflowing = False
         return audio
 
     # -- Lifecycle -----------------------------------------------------------
@@ -353,6 +572,7 @@ class StressDetector:
             self._subscriber = self.bus.create_subscriber(
                 ports=[AUDIO_PORT],
                 topics=["audio"],
+                hwm=AUDIO_HWM,
             )
         if self._publisher is None:
             self._publisher = self.bus.create_publisher(STRESS_PORT)
@@ -367,6 +587,10 @@ class StressDetector:
         try:
             self._main_loop()
         finally:
+            # Let an in-flight window finish and publish before returning.
+            # The worker stays up so start() can run again; close() ends it.
+            if self._inflight is not None:
+                wait([self._inflight])
             self.running = False
             logger.info("StressDetector stopped")
 
@@ -376,6 +600,10 @@ class StressDetector:
         self.running = False
         logger.info("StressDetector stop signal sent")
 
+    def close(self) -> None:
+        """Shut down the inference worker.  Call after the last :meth:`start`."""
+        self._predict_exec.shutdown(wait=True)
+
     # -- Main loop -----------------------------------------------------------
 
     def _main_loop(self) -> None:
@@ -388,49 +616,91 @@ class StressDetector:
             _, envelope = result
             data: dict[str, Any] = envelope["data"]
 
-            # Update sample rate from the source (in case it differs).
-            self._sample_rate = int(data.get("sample_rate", self._sample_rate))
-
-            # Decode and accumulate.
-            chunk: np.ndarray = self._decode_audio(data)
-            self._buffer.extend(chunk.tolist())
-
-            # Run inference when we have enough audio.
-            if self._buffer_ready():
-                audio = self._flush_buffer()
-                audio_secs: float = len(audio) / self._sample_rate
-
-                t_start = time.perf_counter()
-                emotions = self._predict_emotions(audio)
-                latency_ms: float = (time.perf_counter() - t_start) * 1_000.0
-
-                logger.info(
-                    "Processed %.1fs audio in %.0fms (GPU) — "
-                    "arousal=%.3f valence=%.3f dominance=%.3f",
-                    audio_secs,
-                    latency_ms,
-                    emotions["arousal"],
-                    emotions["valence"],
-                    emotions["dominance"],
-                )
+            # Samples travel in the binary frame; a two-frame message comes
+            # from an older publisher (base64 JSON) and carries none.
+            pcm: bytes | None = envelope.get("binary")
+            if pcm is None:
+                if not self._warned_no_pcm:
+                    self._warned_no_pcm = True
+                    logger.warning("Skipping audio messages without a PCM frame")
+                continue
 
-                # Build and publish the stress message.
-                # stress_score = arousal (primary stress proxy).
-                stress_msg: dict[str, Any] = {
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                    "stress_score": emotions["arousal"],
-                    "emotions": {
-                        "arousal": emotions["arousal"],
-                        "valence": emotions["valence"],
-                        "dominance": emotions["dominance"],
-                    },
-                    "confidence": emotions["confidence"],
-                }
-                self.bus.publish(
-                    self._publisher,
-                    topic="stress",
-                    data=stress_msg,
-                )
+            # Audio at any other rate would be scored as if it were at the
+            # model's rate (the processor used to raise on this), so drop it.
+            raw_rate = data.get("sample_rate", self._sample_rate)
+            try:
+                rate = int(raw_rate)
+            except (TypeError, ValueError):
+                rate = None
+            if rate != self._sample_rate:
+                if str(raw_rate) not in self._rejected_rates:
+                    self._rejected_rates.add(str(raw_rate))
+                    logger.warning(
+                        "Dropping %r Hz audio; the emotion model needs %d Hz",
+                        raw_rate, self._sample_rate,
+                    )
+                continue
+
+            # Decode straight into the buffer.
+            self._decode_audio(pcm, out=self._reserve(len(pcm) // 2))
+
+            # Run inference when we have enough audio and the previous
+            # window is done; until then keep buffering.
+            if self._buffer_ready() and (self._inflight is None or self._inflight.done()):
+                # Fixed-length windows keep the CUDA graph's shape; the
+                # remainder of the last chunk carries into the next window.
+                # A backlog (inference fell behind) goes out as one batch.
+                n = self.window_samples
+                k = min(self._buffered // n, _MAX_BATCH)
+                windows = self._flush_buffer(k * n).reshape(k, n)
+                self._inflight = self._predict_exec.submit(self._predict_and_publish, windows)
+
+    def _predict_and_publish(self, windows: np.ndarray) -> None:
+        """Worker thread: analyse a batch of windows and publish each reading."""
+        k, n = windows.shape
+        window_secs: float = n / self._sample_rate
+
+        t_start = time.perf_counter()
+        try:
+            batch = self._predict_batch(windows)
+        except Exception:
+            logger.exception("Emotion inference failed (%d × %.1fs audio)", k, window_secs)
+            return
+        latency_ms: float = (time.perf_counter() - t_start) * 1_000.0
+
+        end = datetime.now(timezone.utc)
+        for i, emotions in enumerate(batch):
+            logger.info(
+                "Processed %.1fs audio in %.0fms (GPU, batch of %d) — "
+                "arousal=%.3f valence=%.3f dominance=%.3f",
+                window_secs,
+                latency_ms,
+                k,
+                emotions["arousal"],
+                emotions["valence"],
+                emotions["dominance"],
+            )
+
+            # Build and publish the stress message.
+            # stress_score = arousal (primary stress proxy).
+            # Earlier windows of a batch are stamped one window back each.
+            ts = end - timedelta(seconds=window_secs * (k - 1 - i))
+            stress_msg: dict[str, Any] = {
+                "timestamp": ts,  # formatted by the bus encoder
+                "stress_score": emotions["arousal"],
+                "emotions": {
+                    "arousal": emotions["arousal"],
+                    "valence": emotions["valence"],
+                    "dominance": emotions["dominance"],
+                },
+                "confidence": emotions["confidence"],
+            }
+            self.bus.publish(
+                self._publisher,
+                topic="stress",
+                data=stress_msg,
+                timestamp=ts,
+            )
 
 
 # ---------------------------------------------------------------------------
@@ -535,6 +805,7 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         detector.stop()
 
+    detector.close()
     display_thread.join(timeout=5)
     stress_sub.close()
     print("\nSmoke test complete.")
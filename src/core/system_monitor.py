@@ -112,58 +112,74 @@ def _find_hwmon_power() -> str | None:
     return None
 
 
+_TEGRASTATS_RESTART_S: float = 5.0
+"""Delay before relaunching tegrastats after it exits unexpectedly."""
+
+# tegrastats field patterns, compiled once for the per-line parser.
+_RE_RAM = re.compile(r"RAM\s+(\d+)/(\d+)MB")
+_RE_SWAP = re.compile(r"SWAP\s+(\d+)/(\d+)MB")
+_RE_CPU = re.compile(r"CPU\s+\[([^\]]+)\]")
+_RE_CPU_CORE = re.compile(r"(\d+)%@(\d+)")
+_RE_EMC = re.compile(r"EMC_FREQ\s+\d+%@(\d+)")
+_RE_GPU = re.compile(r"GR3D_FREQ\s+(\d+)%")
+_RE_GPU_TEMP = re.compile(r"gpu@([\d.]+)C")
+_RE_GPU_FREQ = re.compile(r"GR3D_FREQ\s+\d+%@\[?(\d+)")
+# In preference order, not line order, so these stay separate patterns.
+_RE_POWER = tuple(
+    re.compile(p) for p in (r"VDD_CPU_GPU_CV\s+(\d+)", r"VDD_IN\s+(\d+)", r"POM_5V_IN\s+(\d+)")
+)
+
+
 def _parse_tegrastats_line(line: str) -> dict[str, Any]:
     """Parse one tegrastats output line into structured metrics."""
     out: dict[str, Any] = {}
 
     # RAM: "RAM 2345/7620MB (lfb 1x2MB) SWAP 0/3810MB (cached 0MB)"
-    ram_match = re.search(r"RAM\s+(\d+)/(\d+)MB", line)
+    ram_match = _RE_RAM.search(line)
     if ram_match:
         out["ram_used_mb"] = int(ram_match.group(1))
         out["ram_total_mb"] = int(ram_match.group(2))
-    swap_match = re.search(r"SWAP\s+(\d+)/(\d+)MB", line)
+    swap_match = _RE_SWAP.search(line)
     if swap_match:
         out["swap_used_mb"] = int(swap_match.group(1))
         out["swap_total_mb"] = int(swap_match.group(2))
 
     # CPU: "CPU [12%@1510,10%@1510,8%@1510,15%@1510,0%@1510,0%@1510]"
-    cpu_match = re.search(r"CPU\s+\[([^\]]+)\]", line)
+    cpu_match = _RE_CPU.search(line)
     if cpu_match:
-        parts = cpu_match.group(1).split(",")
         per_core: list[float] = []
         freq_mhz: float | None = None
-        for p in parts:
-            m = re.match(r"(\d+)%@(\d+)", p.strip())
-            if m:
-                per_core.append(float(m.group(1)))
-                if freq_mhz is None:
-                    freq_mhz = float(m.group(2))
+        # Offline cores read "off" and simply don't match.
+        for m in _RE_CPU_CORE.finditer(cpu_match.group(1)):
+            per_core.append(float(m.group(1)))
+            if freq_mhz is None:
+                freq_mhz = float(m.group(2))
         out["cpu_percent_per_core"] = per_core
         out["cpu_freq_mhz"] = freq_mhz
 
     # EMC: "EMC_FREQ 0%@2133"
-    emc_match = re.search(r"EMC_FREQ\s+\d+%@(\d+)", line)
+    emc_match = _RE_EMC.search(line)
     if emc_match:
         out["emc_freq_mhz"] = int(emc_match.group(1))
 
     # GPU: "GR3D_FREQ 18%" or "GR3D_FREQ 12%@1300" (Jetson Orin)
-    gpu_match = re.search(r"GR3D_FREQ\s+(\d+)%", line)
+    gpu_match = _RE_GPU.search(line)
     if gpu_match:
         out["gpu_percent"] = int(gpu_match.group(1))
 
     # GPU temperature: "gpu@47.125C"
-    gpu_temp_match = re.search(r"gpu@([\d.]+)C", line)
+    gpu_temp_match = _RE_GPU_TEMP.search(line)
     if gpu_temp_match:
         out["gpu_temp_c"] = round(float(gpu_temp_match.group(1)), 1)
 
     # GPU frequency (optional): "GR3D_FREQ 12%@1300"
-    gpu_freq_match = re.search(r"GR3D_FREQ\s+\d+%@\[?(\d+)", line)
+    gpu_freq_match = _RE_GPU_FREQ.search(line)
     if gpu_freq_match:
         out["gpu_freq_mhz"] = int(gpu_freq_match.group(1))
 
     # Power: "VDD_CPU_GPU_CV 8210/8045" or "VDD_IN 8234"
-    for pat in [r"VDD_CPU_GPU_CV\s+(\d+)", r"VDD_IN\s+(\d+)", r"POM_5V_IN\s+(\d+)"]:
-        pow_match = re.search(pat, line)
+    for pat in _RE_POWER:
+        pow_match = pat.search(line)
         if pow_match:
             out["power_mw"] = int(pow_match.group(1))
             break
@@ -171,29 +187,6 @@ def _parse_tegrastats_line(line: str) -> dict[str, Any]:
     return out
 
 
-def _try_tegrastats(interval_ms: int = 1000) -> dict[str, Any] | None:
-    """Run tegrastats, read one line, kill it. Returns None if unavailable."""
-    proc = None
-    try:
-        proc = subprocess.Popen(
-            ["tegrastats", "--interval", str(interval_ms)],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL,
-            text=True,
-        )
-        # Read first line (blocks until available)
-        line = proc.stdout.readline()
-        if not line:
-            return None
-        return _parse_tegrastats_line(line.strip())
-    except (FileNotFoundError, OSError):
-        return None
-    finally:
-        if proc:
-            proc.kill()
-            proc.wait()
-
-
 def _get_per_process_memory() -> dict[str, float]:
     """Get RSS in MB for pipeline processes by matching cmdline."""
     try:
@@ -319,6 +312,83 @@ class SystemMonitor:
         self._latency = PipelineLatency()
         self._stop = threading.Event()
         self._tegrastats_proc: subprocess.Popen | None = None
+        # Latest parsed tegrastats line, written by the reader thread.
+        self._tegra_lock = threading.Lock()
+        self._last_tegra: dict[str, Any] | None = None
+        self._tegrastats_interval_ms: int = 1000
+        self._tegrastats_thread: threading.Thread | None = None
+        # Serialises launches against _stop_tegrastats, so a relaunch racing
+        # shutdown either sees _stop or leaves a process that gets stopped.
+        self._tegrastats_lock = threading.Lock()
+
+    def _start_tegrastats(self, interval_ms: int = 1000) -> None:
+        """Launch one long-lived tegrastats and follow its output.
+
+        A no-op off Jetson (tegrastats missing); metrics then fall back to
+        psutil and sysfs.
+        """
+        self._tegrastats_interval_ms = interval_ms
+        with self._tegrastats_lock:
+            if self._stop.is_set():
+                return
+            try:
+                self._tegrastats_proc = subprocess.Popen(
+                    ["tegrastats", "--interval", str(interval_ms)],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    bufsize=1,
+                )
+            except (FileNotFoundError, OSError):
+                logger.debug("tegrastats unavailable; using psutil/sysfs metrics")
+                return
+            self._tegrastats_thread = threading.Thread(
+                target=self._read_tegrastats,
+                args=(self._tegrastats_proc,),
+                name="tegrastats",
+                daemon=True,
+            )
+            self._tegrastats_thread.start()
+
+    def _read_tegrastats(self, proc: subprocess.Popen) -> None:
+        """Reader thread: parse each tegrastats line as it arrives.
+
+        When tegrastats exits the cached line is cleared, so metrics fall
+        back rather than repeating stale values, and it is relaunched after
+        :data:`_TEGRASTATS_RESTART_S` unless the monitor is stopping.
+        """
+        for line in proc.stdout:
+            tegra = _parse_tegrastats_line(line.strip())
+            with self._tegra_lock:
+                self._last_tegra = tegra
+        with self._tegra_lock:
+            self._last_tegra = None
+        # Release the pipe and reap the process before any relaunch.
+        proc.stdout.close()
+        code = proc.wait()
+        if self._stop.is_set():
+            return
+        logger.warning(
+            "tegrastats exited (code %s); restarting in %.0fs",
+            code, _TEGRASTATS_RESTART_S,
+        )
+        if not self._stop.wait(_TEGRASTATS_RESTART_S):
+            self._start_tegrastats(self._tegrastats_interval_ms)
+
+    def _stop_tegrastats(self) -> None:
+        """Terminate tegrastats and join its reader.  Call after setting ``_stop``."""
+        with self._tegrastats_lock:
+            proc, self._tegrastats_proc = self._tegrastats_proc, None
+            thread, self._tegrastats_thread = self._tegrastats_thread, None
+        if proc is not None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+        if thread is not None:
+            thread.join(timeout=2)
 
     def _collect_metrics(self) -> dict[str, Any]:
         """Gather all metrics from available sources."""
@@ -334,8 +404,9 @@ class SystemMonitor:
         cpu_temp = _get_cpu_temp()
         gpu_temp = _get_gpu_temp()
 
-        # Jetson-specific: tegrastats
-        tegra = _try_tegrastats(1000)
+        # Jetson-specific: latest line from the tegrastats reader
+        with self._tegra_lock:
+            tegra = self._last_tegra
         if tegra:
             if "ram_used_mb" in tegra:
                 mem["used_mb"] = tegra["ram_used_mb"]
@@ -443,10 +514,12 @@ class SystemMonitor:
         """Start listener thread and publisher loop (blocking)."""
         listener = threading.Thread(target=self._zmq_listener, daemon=True)
         listener.start()
+        self._start_tegrastats(int(self.interval_sec * 1000))
         try:
             self._run_publisher()
         finally:
             self._stop.set()
+            self._stop_tegrastats()
 
 
 def _get_swap_psutil() -> dict[str, Any]:
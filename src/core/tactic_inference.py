@@ -379,7 +379,8 @@ class TacticInferenceService:
         try:
             frames: list[bytes] = self._sub_transcript.recv_multipart(zmq.NOBLOCK)
             raw_body: str = frames[1].decode("utf-8")
-            logger.debug("Transcript raw message: %s", raw_body[:500] + ("..." if len(raw_body) > 500 else ""))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Transcript raw message: %s", raw_body[:500] + ("..." if len(raw_body) > 500 else ""))
             envelope: dict[str, Any] = json.loads(raw_body)
             data = envelope.get("data", {})
             text = data.get("text", "").strip()
@@ -396,7 +397,8 @@ class TacticInferenceService:
         try:
             frames: list[bytes] = self._sub_stress.recv_multipart(zmq.NOBLOCK)
             raw_body: str = frames[1].decode("utf-8")
-            logger.debug("Stress raw message: %s", raw_body[:300] + ("..." if len(raw_body) > 300 else ""))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Stress raw message: %s", raw_body[:300] + ("..." if len(raw_body) > 300 else ""))
             envelope: dict[str, Any] = json.loads(raw_body)
             data = envelope.get("data", {})
             score = data.get("stress_score", data.get("score", 0.5))
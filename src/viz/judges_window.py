@@ -35,7 +35,6 @@ if _PROJECT_ROOT not in sys.path:
     sys.path.insert(0, _PROJECT_ROOT)
 
 # -- Standard / third-party imports -----------------------------------------
-import base64
 import logging
 import math
 import threading
@@ -82,14 +81,14 @@ yields ~3 updates/s — smooth without flooding the browser.
 # ---------------------------------------------------------------------------
 
 
-def compute_rms(b64_samples: str) -> float:
-    """Decode base64-encoded int16 PCM and return the RMS level in [0, 1].
+def compute_rms(pcm: bytes) -> float:
+    """Return the RMS level in [0, 1] of an int16 PCM chunk.
 
     Parameters
     ----------
-    b64_samples:
-        Base64-encoded bytes of little-endian int16 samples (matching
-        the wire format produced by ``audio_capture``).
+    pcm:
+        Little-endian int16 samples (the binary frame ``audio_capture``
+        publishes, found under ``envelope["binary"]``).
 
     Returns
     -------
@@ -97,8 +96,7 @@ def compute_rms(b64_samples: str) -> float:
         Root Mean Square of the normalised signal.  0.0 = silence,
         1.0 = full-scale.
     """
-    raw: bytes = base64.b64decode(b64_samples)
-    samples: np.ndarray = np.frombuffer(raw, dtype=np.int16).astype(np.float32)
+    samples: np.ndarray = np.frombuffer(pcm, dtype=np.int16).astype(np.float32)
     samples /= 32768.0
     rms: float = float(np.sqrt(np.mean(samples ** 2)))
     return rms
@@ -3319,9 +3317,9 @@ def zmq_listener(socketio: SocketIO, bus: MessageBus | None = None) -> None:
                 audio_chunk_count += 1
                 if audio_chunk_count % AUDIO_EMIT_INTERVAL != 0:
                     continue
-                b64_samples: str = data.get("samples", "")
-                if b64_samples:
-                    rms = compute_rms(b64_samples)
+                pcm: bytes = envelope.get("binary", b"")
+                if pcm:
+                    rms = compute_rms(pcm)
                     payload = {
                         "rms": round(rms, 4),
                         "timestamp": timestamp,
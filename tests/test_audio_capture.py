@@ -7,15 +7,14 @@ Tests cover:
     - AudioConfig dataclass defaults and overrides
     - AudioCapture construction and socket creation
     - list_devices() static method
-    - _audio_callback encodes int16 → base64 correctly
-    - Published message structure (samples, timestamp, sample_rate)
+    - _audio_callback converts float32 → int16 PCM bytes correctly
+    - Published message structure (timestamp, sample_rate, PCM binary frame)
     - start / stop lifecycle (running flag, thread join)
     - Graceful handling when no audio device is found
 """
 
 from __future__ import annotations
 
-import base64
 import json
 import queue
 import time
@@ -177,7 +176,7 @@ class TestListDevices:
 # ---------------------------------------------------------------------------
 
 class TestAudioCallback:
-    """The sounddevice callback must base64-encode int16 samples and enqueue."""
+    """The sounddevice callback must convert samples to int16 PCM and enqueue."""
 
     @pytest.fixture(autouse=True)
     def _capture(self) -> None:
@@ -191,25 +190,25 @@ class TestAudioCallback:
 
         assert not self.capture._queue.empty()
 
-    def test_enqueued_data_is_base64_string(self) -> None:
+    def test_enqueued_data_is_raw_pcm_bytes(self) -> None:
         fake_audio = np.zeros((1024, 1), dtype=np.float32)
         self.capture._audio_callback(fake_audio, frames=1024, time_info=None, status=None)
 
         item = self.capture._queue.get_nowait()
-        # item["samples"] should be a valid base64 string.
-        decoded = base64.b64decode(item["samples"])
-        assert isinstance(decoded, bytes)
+        assert isinstance(item["samples"], bytes)
+        assert len(item["samples"]) == 1024 * 2  # int16
 
-    def test_base64_decodes_to_int16_array(self) -> None:
-        """Round-trip: float32 -> int16 bytes -> base64 -> decode -> int16 array."""
+    def test_pcm_decodes_to_int16_array(self) -> None:
+        """Round-trip: float32 -> int16 bytes -> int16 array."""
         rng = np.random.default_rng(42)
         fake_audio = rng.uniform(-0.8, 0.8, (1024, 1)).astype(np.float32)
         self.capture._audio_callback(fake_audio, frames=1024, time_info=None, status=None)
 
         item = self.capture._queue.get_nowait()
-        raw_bytes = base64.b64decode(item["samples"])
-        recovered = np.frombuffer(raw_bytes, dtype=np.int16)
+        recovered = np.frombuffer(item["samples"], dtype=np.int16)
         assert recovered.shape == (1024,)
+        expected = (fake_audio[:, 0] * 32767).astype(np.int16)
+        assert np.array_equal(recovered, expected)
 
     def test_enqueued_item_has_timestamp(self) -> None:
         fake_audio = np.zeros((1024, 1), dtype=np.float32)
@@ -217,8 +216,9 @@ class TestAudioCallback:
 
         item = self.capture._queue.get_nowait()
         assert "timestamp" in item
-        # Must parse as ISO 8601.
-        datetime.fromisoformat(item["timestamp"])
+        # Captured as an aware datetime; the bus encoder formats it.
+        assert isinstance(item["timestamp"], datetime)
+        assert item["timestamp"].tzinfo is not None
 
     def test_enqueued_item_has_sample_rate(self) -> None:
         fake_audio = np.zeros((1024, 1), dtype=np.float32)
@@ -235,8 +235,7 @@ class TestAudioCallback:
         capture._audio_callback(fake_audio, frames=1024, time_info=None, status=None)
 
         item = capture._queue.get_nowait()
-        decoded = base64.b64decode(item["samples"])
-        recovered = np.frombuffer(decoded, dtype=np.int16)
+        recovered = np.frombuffer(item["samples"], dtype=np.int16)
         expected_len = int(1024 * 16000 / 44100)
         assert len(recovered) == expected_len
         assert item["sample_rate"] == 16000
@@ -264,19 +263,22 @@ class TestPublishMessageFormat:
         self.sub.close()
         self.pub.close()
 
-    def test_published_message_has_samples_field(self) -> None:
+    def test_published_message_carries_pcm_frame(self) -> None:
         fake_audio = np.zeros((1024, 1), dtype=np.float32)
         self.capture._audio_callback(fake_audio, frames=1024, time_info=None, status=None)
         # Drain queue manually to simulate publish loop.
         item = self.capture._queue.get_nowait()
-        self.bus.publish(self.pub, topic="audio", data=item)
+        self.capture._publish(item)
 
         result = self.bus.receive(self.sub, timeout_ms=2000)
         assert result is not None
         _, envelope = result
-        assert "samples" in envelope["data"]
+        assert "samples" not in envelope["data"]
         assert "sample_rate" in envelope["data"]
-        assert "timestamp" in envelope["data"]
+        assert envelope["data"]["timestamp"] == envelope["timestamp"]
+        datetime.fromisoformat(envelope["timestamp"])
+        assert len(np.frombuffer(envelope["binary"], dtype=np.int16)) == 1024
+        assert self.capture.published_count == 1
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,562 @@
+"""Unit tests for src.core.content_analyzer – two-tier scam detection.
+
+Hardware- and network-independent: ``SentenceTransformer`` is replaced by a
+deterministic bag-of-words embedder so tests run without downloading a
+model.  VADER, the Tier-1 phrase list, and the benign patterns are real.
+
+Tests cover:
+    - Tier 1 phrase matching
+    - Tier 2 best match and top-k scenarios
+    - Embedder backend selection
+    - Torch thread cap applied at service startup, not in the loader
+    - Benign-context override
+    - Prosodics counters (hesitations, questions, pauses)
+    - Shared VADER instance
+    - analyze() result shape
+    - ContentAnalyzerService batch intake and publish hand-off to the writer thread
+    - Optional worker-process analysis
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import zlib
+from dataclasses import asdict
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from src.core import content_analyzer
+from src.core.content_analyzer import (
+    _TIER1_MINIMAL,
+    _TIER2_CACHE_SIZE,
+    BENIGN_PATTERNS,
+    TIER1_PHRASES,
+    ContentAnalyzer,
+    ContentAnalyzerService,
+    SentimentResult,
+    StressMessage,
+    TacticMessage,
+    _analyze_in_worker,
+    _load_embedder,
+)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+class _FakeEmbedder:
+    """Deterministic stand-in for ``SentenceTransformer`` (hashed bag of words)."""
+
+    DIM = 64
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def encode(self, texts: list[str], **kwargs: Any) -> np.ndarray:
+        out = np.zeros((len(texts), self.DIM), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                out[row, zlib.crc32(word.encode()) % self.DIM] += 1.0
+        if kwargs.get("normalize_embeddings"):
+            norms = np.linalg.norm(out, axis=1, keepdims=True)
+            out /= np.maximum(norms, 1e-12)
+        return out
+
+
+# Minimal analyze() result accepted by ContentAnalyzerService._run_analysis.
+_RESULT: dict[str, Any] = {
+    "stress_score": 0.1, "speech_patterns": {}, "sentiment": SentimentResult(),
+    "confidence": 0.5, "tactics": {}, "tactic_labels": {},
+    "detection_trigger": None, "top_scenarios": [], "risk_level": "low",
+    "risk_score": 0.0, "risk_factors": [], "inference_time_ms": 1.0,
+}
+
+
+@pytest.fixture
+def analyzer() -> ContentAnalyzer:
+    with patch("src.core.content_analyzer.SentenceTransformer", _FakeEmbedder):
+        a = ContentAnalyzer()
+    yield a
+    a.close()
+
+
+# ---------------------------------------------------------------------------
+# Tier 1
+# ---------------------------------------------------------------------------
+
+class TestTier1:
+    """Unambiguous phrases must be found as case-insensitive substrings."""
+
+    def test_detects_gift_card_phrase(self, analyzer: ContentAnalyzer) -> None:
+        matches = analyzer._check_tier1("Okay I will go to Walgreens and BUY GIFT CARDS")
+        assert "go to walgreens" in matches
+        assert "buy gift cards" in matches
+
+    def test_no_match_on_small_talk(self, analyzer: ContentAnalyzer) -> None:
+        assert analyzer._check_tier1("the weather has been lovely this week") == []
+
+    def test_matches_follow_phrase_list_order(self, analyzer: ContentAnalyzer) -> None:
+        matches = analyzer._check_tier1("i can read you the numbers on the back right now")
+        assert matches == sorted(matches, key=TIER1_PHRASES.index)
+        assert "read you the numbers on the back" in matches
+        assert "read you the numbers" in matches
+
+    @pytest.mark.parametrize("transcript", [
+        "sure i will go get the gift cards and read you the numbers on the back",
+        "i won't tell my family, i'm going to the bitcoin atm now",
+        "let me download that software for you and give you remote access",
+        "nothing suspicious here at all",
+    ])
+    def test_matches_equal_linear_scan(
+        self, analyzer: ContentAnalyzer, transcript: str,
+    ) -> None:
+        expected = list(dict.fromkeys(p for p in TIER1_PHRASES if p in transcript))
+        assert analyzer._check_tier1(transcript) == expected
+        with patch("src.core.content_analyzer._TIER1_AUTOMATON", None):
+            assert analyzer._check_tier1(transcript) == expected
+
+    def test_minimal_set_has_no_dominated_phrases(self) -> None:
+        for p in _TIER1_MINIMAL:
+            assert not any(q != p and q in p for q in _TIER1_MINIMAL)
+        assert len(_TIER1_MINIMAL) < len(TIER1_PHRASES)
+
+
+# ---------------------------------------------------------------------------
+# Tier 2
+# ---------------------------------------------------------------------------
+
+class TestTier2:
+    """Semantic matching must report the best scenario and a sorted top-k."""
+
+    def test_short_transcript_skipped(self, analyzer: ContentAnalyzer) -> None:
+        assert analyzer._check_tier2("hi there") == (0.0, "", "", [])
+
+    def test_top_k_sorted_and_consistent(self, analyzer: ContentAnalyzer) -> None:
+        score, scenario, category, top = analyzer._check_tier2(
+            "someone is asking me to buy gift cards and read the codes",
+        )
+        assert len(top) == analyzer._topk
+        assert top[0] == (scenario, category, score)
+        sims = [sim for _, _, sim in top]
+        assert sims == sorted(sims, reverse=True)
+
+    def test_repeated_transcript_skips_encode(self, analyzer: ContentAnalyzer) -> None:
+        text = "someone is asking me to buy gift cards and read the codes"
+        first = analyzer._check_tier2(text)
+        with patch.object(analyzer.embedder, "encode", side_effect=AssertionError):
+            assert analyzer._check_tier2(text) == first
+
+    def test_analyze_skips_tier2_thread_when_result_known(
+        self, analyzer: ContentAnalyzer,
+    ) -> None:
+        text = "someone is asking me to buy gift cards and read the codes"
+        first = analyzer.analyze(text)
+        with patch.object(analyzer, "_tier2_exec") as exec_:
+            again = analyzer.analyze(text)
+            short = analyzer.analyze("hi there")
+        exec_.submit.assert_not_called()
+        assert again["top_scenarios"] == first["top_scenarios"]
+        assert short["top_scenarios"] == []
+
+    def test_cache_is_bounded(self, analyzer: ContentAnalyzer) -> None:
+        analyzer._check_tier2_batch([f"call number {i} please" for i in range(_TIER2_CACHE_SIZE + 5)])
+        assert len(analyzer._tier2_cache) == _TIER2_CACHE_SIZE
+        assert "call number 0 please" not in analyzer._tier2_cache
+
+    def test_score_is_cosine_similarity(self, analyzer: ContentAnalyzer) -> None:
+        text = "someone is asking me to buy gift cards and read the codes"
+        score, scenario, _, _ = analyzer._check_tier2(text)
+        q = analyzer.embedder.encode([text])[0]
+        e = analyzer.scenario_embeddings[analyzer.scenario_descriptions.index(scenario)]
+        expected = float(q @ e / (np.linalg.norm(q) * np.linalg.norm(e)))
+        assert score == pytest.approx(expected, abs=1e-6)
+
+    def test_batch_larger_than_sim_buffer(self, analyzer: ContentAnalyzer) -> None:
+        texts = [f"caller number {i} wants gift cards" for i in range(len(analyzer._sim_buf) + 3)]
+        batch = analyzer._check_tier2_batch(texts)
+        analyzer._tier2_cache.clear()
+        for text, result in zip(texts[::10], batch[::10]):
+            assert analyzer._check_tier2(text)[0] == pytest.approx(result[0], abs=1e-6)
+
+
+class TestEmbedderBackend:
+    """The embedder runtime is selectable; int8 ONNX picks a CPU-specific export."""
+
+    @pytest.mark.parametrize("machine, file_name", [
+        ("aarch64", "onnx/model_qint8_arm64.onnx"),
+        ("x86_64", "onnx/model_quint8_avx2.onnx"),
+    ])
+    def test_onnx_int8_loads_quantized_export(self, machine: str, file_name: str) -> None:
+        with patch("src.core.content_analyzer.SentenceTransformer") as st, \
+                patch("platform.machine", return_value=machine):
+            _load_embedder("all-MiniLM-L6-v2", "onnx-int8")
+        assert st.call_args.kwargs["backend"] == "onnx"
+        assert st.call_args.kwargs["model_kwargs"] == {"file_name": file_name}
+
+    def test_unknown_backend_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            _load_embedder("all-MiniLM-L6-v2", "tensorrt")
+
+    def test_torch_loader_leaves_thread_count_alone(self) -> None:
+        with patch("src.core.content_analyzer.SentenceTransformer"), \
+                patch("torch.set_num_threads") as set_threads:
+            _load_embedder("all-MiniLM-L6-v2", "torch")
+        set_threads.assert_not_called()
+
+
+class TestTorchThreads:
+    """The torch thread cap is applied once, where the models are loaded."""
+
+    def test_default_leaves_torch_alone(self) -> None:
+        with patch("src.core.content_analyzer.SentenceTransformer", _FakeEmbedder), \
+                patch("torch.set_num_threads") as set_threads:
+            ContentAnalyzerService(bus=MagicMock())
+        set_threads.assert_not_called()
+
+    def test_in_process_service_applies_cap(self) -> None:
+        with patch("src.core.content_analyzer.SentenceTransformer", _FakeEmbedder), \
+                patch("torch.set_num_threads") as set_threads:
+            ContentAnalyzerService(bus=MagicMock(), torch_threads=3)
+        set_threads.assert_called_once_with(3)
+
+    def test_worker_process_applies_cap(self) -> None:
+        with patch("src.core.content_analyzer.ProcessPoolExecutor") as pool, \
+                patch("torch.set_num_threads") as set_threads:
+            ContentAnalyzerService(bus=MagicMock(), use_subprocess=True, torch_threads=3)
+        set_threads.assert_not_called()  # not in this process
+        initializer = pool.call_args.kwargs["initializer"]
+        initargs = pool.call_args.kwargs["initargs"]
+
+        with patch("src.core.content_analyzer.SentenceTransformer", _FakeEmbedder), \
+                patch("torch.set_num_threads") as set_threads, \
+                patch.object(content_analyzer, "_worker_analyzer", None):
+            initializer(*initargs)
+        set_threads.assert_called_once_with(3)
+
+
+class TestTactics:
+    """Tactic scores from the scenario category and Tier 1 phrase hints."""
+
+    def test_category_raises_its_tactic(self, analyzer: ContentAnalyzer) -> None:
+        tactics = analyzer._infer_tactics([], 0.5, "urgency", SentimentResult())
+        assert tactics["urgency"] == 0.85
+        assert analyzer._infer_tactics([], 0.3, "urgency", SentimentResult())["urgency"] == 0.1
+
+    @pytest.mark.parametrize("phrase, expected", [
+        ("warrant for my arrest", {"fear": 0.8, "authority": 0.7}),
+        ("don't tell anyone", {"isolation": 0.85}),
+        ("my ssn is", {"authority": 0.75}),
+        ("wire money", {"financial": 0.85}),
+        ("give you remote access", {"isolation": 0.8}),
+        ("processing fee", {}),
+    ])
+    def test_phrase_hints(
+        self, analyzer: ContentAnalyzer, phrase: str, expected: dict[str, float],
+    ) -> None:
+        tactics = analyzer._infer_tactics([phrase], 0.0, "", SentimentResult())
+        assert {k: v for k, v in tactics.items() if v != 0.1} == expected
+
+
+# ---------------------------------------------------------------------------
+# Benign context
+# ---------------------------------------------------------------------------
+
+class TestBenignContext:
+    """Legitimate context must override suspicious wording."""
+
+    def test_birthday_gift_is_benign(self, analyzer: ContentAnalyzer) -> None:
+        is_benign, matched = analyzer._check_benign_context(
+            "I want to buy a gift card for my grandson's birthday",
+        )
+        assert is_benign
+        assert matched
+
+    def test_benign_forces_low_risk(self, analyzer: ContentAnalyzer) -> None:
+        result = analyzer.analyze("I need to buy a gift card for my nephew's birthday party")
+        assert result["risk_level"] == "low"
+        assert result["benign_override"] is True
+
+    @pytest.mark.parametrize("text", [
+        "I paid my electric bill and then went to the church potluck",
+        "GIFT FOR MY GRANDSON, he loves video games",
+        "Grab a credit card, we need to finish the checkout",
+        "Please buy gift cards and read me the numbers",
+    ])
+    def test_matches_equal_stdlib_re(self, analyzer: ContentAnalyzer, text: str) -> None:
+        expected = [p[:50] for p in BENIGN_PATTERNS if re.search(p, text, re.IGNORECASE)]
+        assert analyzer._check_benign_context(text) == (bool(expected), expected)
+
+
+# ---------------------------------------------------------------------------
+# Prosodics
+# ---------------------------------------------------------------------------
+
+class TestProsodics:
+    """Speech-pattern counters must reflect fillers, questions, and pauses."""
+
+    def test_hesitation_count(self, analyzer: ContentAnalyzer) -> None:
+        p = analyzer._analyze_prosodics("um well I uh you know I mean it is fine")
+        # um, well, uh + " you know " + " i mean "
+        assert p.hesitation_count == 5
+        assert p.hesitation_label == "elevated"
+
+    def test_question_indicators(self, analyzer: ContentAnalyzer) -> None:
+        p = analyzer._analyze_prosodics("What? Why do you need that? huh")
+        # two '?' + what, why, huh
+        assert p.question_indicators == 5
+
+    def test_pause_indicators(self, analyzer: ContentAnalyzer) -> None:
+        p = analyzer._analyze_prosodics("well... I'm not sure.. okay")
+        # "..." counts as "..." and ".."; plus the standalone ".."
+        assert p.pause_ratio == pytest.approx(3 / 5)
+        assert p.uncertainty_count == 1
+
+    @pytest.mark.parametrize("dots", ["..", "...", "....", ".....", "......"])
+    def test_dot_runs_match_separate_counts(
+        self, analyzer: ContentAnalyzer, dots: str,
+    ) -> None:
+        text = f"so{dots} okay"
+        p = analyzer._analyze_prosodics(text)
+        expected = text.count("...") + text.count("..")
+        assert p.pause_ratio == pytest.approx(min(expected / 2, 1.0))
+
+    def test_repeated_filler_counted_twice(self, analyzer: ContentAnalyzer) -> None:
+        # str.count(" you know ") found one: the repeats share a space.
+        p = analyzer._analyze_prosodics("so you know you know it is okay")
+        assert p.hesitation_count == 2
+
+    def test_recent_matches_deduplicated(self, analyzer: ContentAnalyzer) -> None:
+        p = analyzer._analyze_prosodics("um um uh maybe")
+        assert p.recent_matches == ["um", "uh", '"maybe"']
+
+
+# ---------------------------------------------------------------------------
+# Sentiment
+# ---------------------------------------------------------------------------
+
+class TestSentiment:
+    """VADER is loaded once per process and shared."""
+
+    def test_vader_shared_between_instances(self, analyzer: ContentAnalyzer) -> None:
+        with patch("src.core.content_analyzer.SentenceTransformer", _FakeEmbedder):
+            other = ContentAnalyzer()
+        try:
+            assert other.vader is analyzer.vader
+        finally:
+            other.close()
+
+
+# ---------------------------------------------------------------------------
+# analyze()
+# ---------------------------------------------------------------------------
+
+class TestAnalyze:
+    """analyze() must return the dashboard-compatible result dict."""
+
+    def test_tier1_match_is_high_risk(self, analyzer: ContentAnalyzer) -> None:
+        result = analyzer.analyze("okay I will buy gift cards and read you the code")
+        assert result["risk_level"] == "high"
+        assert result["detection_trigger"]["match_type"] == "Tier 1 (exact phrase)"
+        assert result["tactics"]["financial"] >= 0.85
+
+    def test_result_keys(self, analyzer: ContentAnalyzer) -> None:
+        result = analyzer.analyze("hello how are you doing today my friend")
+        for key in (
+            "risk_level", "risk_score", "confidence", "risk_factors", "tactics",
+            "tactic_labels", "detection_trigger", "prosodics", "speech_patterns",
+            "sentiment", "stress_score", "inference_time_ms",
+        ):
+            assert key in result
+        assert isinstance(result["sentiment"], SentimentResult)
+
+    def test_batch_matches_single_analyses(self, analyzer: ContentAnalyzer) -> None:
+        texts = [
+            "please buy gift cards and read me the numbers on the back",
+            "hi there",
+            "the weather has been lovely this week my friend",
+        ]
+        for text, result in zip(texts, analyzer.analyze_batch(texts)):
+            single = analyzer.analyze(text)
+            for key in ("risk_level", "risk_score", "tactics", "detection_trigger", "prosodics"):
+                assert result[key] == single[key]
+            assert [s["scenario"] for s in result["top_scenarios"]] == [
+                s["scenario"] for s in single["top_scenarios"]
+            ]
+            assert [s["similarity"] for s in result["top_scenarios"]] == pytest.approx(
+                [s["similarity"] for s in single["top_scenarios"]], abs=1e-6,
+            )
+
+    def test_prosodics_dict_covers_every_field(self, analyzer: ContentAnalyzer) -> None:
+        transcript = "um well what do you mean... I'm not sure"
+        result = analyzer.analyze(transcript)
+        expected = asdict(analyzer._analyze_prosodics(transcript, 2.5))
+        assert result["prosodics"] == expected
+
+
+# ---------------------------------------------------------------------------
+# ContentAnalyzerService publishing
+# ---------------------------------------------------------------------------
+
+class TestServicePublish:
+    """Publishes must go through the writer thread, never the analysis path."""
+
+    @pytest.fixture
+    def service(self) -> ContentAnalyzerService:
+        with patch("src.core.content_analyzer.SentenceTransformer", _FakeEmbedder):
+            svc = ContentAnalyzerService(bus=MagicMock())
+        svc._stress_pub = MagicMock(name="stress_pub")
+        svc._tactic_pub = MagicMock(name="tactic_pub")
+        return svc
+
+    def test_writer_thread_publishes_queued_messages(
+        self, service: ContentAnalyzerService,
+    ) -> None:
+        service._tx_thread = threading.Thread(target=service._pub_loop, daemon=True)
+        service._tx_thread.start()
+        service._enqueue_publish("stress", StressMessage(0.5, {}, {}, 0.5, "t0"))
+        service._enqueue_publish("tactics", TacticMessage(
+            {}, {}, {}, [], "low", 0.0, [], "", 0, 1.0, "t0",
+        ))
+        service._cleanup()
+
+        calls = service.bus.publish.call_args_list
+        assert [c.args[1] for c in calls] == ["stress", "tactics"]
+        assert [c.args[3] for c in calls] == ["t0", "t0"]
+        assert calls[0].args[0] is service._stress_pub
+        assert calls[1].args[0] is service._tactic_pub
+
+    def test_full_queue_drops_instead_of_blocking(
+        self, service: ContentAnalyzerService,
+    ) -> None:
+        stress = StressMessage(0.5, {}, {}, 0.5, "t0")
+        tactics = TacticMessage({}, {}, {}, [], "low", 0.0, [], "", 0, 1.0, "t0")
+        messages = [("stress", stress), ("tactics", tactics)]
+        for i in range(service._tx_queue.maxsize):
+            service._enqueue_publish(*messages[i % 2])
+        service._enqueue_publish("stress", StressMessage(0.9, {}, {}, 0.5, "t1"))
+        assert service._tx_queue.full()
+        queued = [service._tx_queue.get_nowait() for _ in range(service._tx_queue.maxsize)]
+        assert all(msg.timestamp == "t0" for _, msg in queued)  # overflow was dropped
+
+    def test_main_loop_buffers_whole_batch(
+        self, service: ContentAnalyzerService,
+    ) -> None:
+        def _env(text: str, is_final: bool = True) -> tuple[str, dict[str, Any]]:
+            return "transcript", {"data": {"text": text, "is_final": is_final}}
+
+        batch = [
+            _env(" hello there"), _env("(silence)"), _env(""), _env("   "),
+            _env("partial", False), ("transcript", {}), _env("bye"),
+        ]
+
+        def _drain(*args: Any, **kwargs: Any) -> list[tuple[str, dict[str, Any]]]:
+            service._stop.set()
+            return batch
+
+        service.bus.drain.side_effect = _drain
+        service._maybe_analyze = MagicMock()
+        service._main_loop()
+
+        assert list(service._accumulated) == ["hello there", "bye"]
+        assert service._word_count == 3
+        service._maybe_analyze.assert_called_once()
+
+    def test_word_gate_uses_running_count(
+        self, service: ContentAnalyzerService,
+    ) -> None:
+        service._analyzer = MagicMock()
+        service._accumulated.append("one two three")
+        service._word_count = 3
+        service._maybe_analyze()
+        service._analyzer.analyze.assert_not_called()
+
+        service._accumulated.append("four five six seven eight")
+        service._word_count += 5
+        service._analyzer.analyze.return_value = _RESULT
+        service._maybe_analyze()
+        service._analysis.result(timeout=5)
+        service._analyzer.analyze.assert_called_once()
+        assert service._analyzer.analyze.call_args.args[0] == (
+            "one two three four five six seven eight"
+        )
+        assert service._tx_queue.get_nowait()[0] == "stress"
+        assert service._tx_queue.get_nowait()[1].word_count == 8
+        assert service._word_count == 0 and not service._accumulated
+
+    def test_unchanged_stress_reading_not_republished(
+        self, service: ContentAnalyzerService,
+    ) -> None:
+        service._analyzer = MagicMock()
+        service._analyzer.analyze.return_value = _RESULT
+        service._run_analysis("one two three", 3)
+        service._run_analysis("four five six", 3)
+
+        topics = []
+        while not service._tx_queue.empty():
+            topics.append(service._tx_queue.get_nowait()[0])
+        assert topics == ["stress", "tactics", "tactics"]
+
+        service._analyzer.analyze.return_value = {**_RESULT, "stress_score": 0.9}
+        service._run_analysis("seven eight nine", 3)
+        assert service._tx_queue.get_nowait()[1].stress_score == 0.9
+
+    def test_subprocess_mode_routes_analysis_to_worker_pool(
+        self, service: ContentAnalyzerService,
+    ) -> None:
+        service._analyzer = None
+        service._worker_pool = MagicMock()
+        service._worker_pool.submit.return_value.result.return_value = _RESULT
+        service._run_analysis("one two three", 3)
+
+        service._worker_pool.submit.assert_called_once_with(
+            _analyze_in_worker, "one two three", service.analysis_interval,
+        )
+        assert service._tx_queue.get_nowait()[0] == "stress"
+        assert service._tx_queue.get_nowait()[1].transcript == "one two three"
+
+    def test_buffer_keeps_filling_during_analysis(
+        self, service: ContentAnalyzerService,
+    ) -> None:
+        release = threading.Event()
+        service._analyzer = MagicMock()
+        service._analyzer.analyze.side_effect = lambda *a, **k: release.wait(5) and _RESULT
+        service._accumulated.append("one two three four five six seven eight")
+        service._word_count = 8
+        service._maybe_analyze()
+        assert not service._accumulated
+
+        # A second call while the first is in flight must not start another.
+        service._last_analysis_ns = 0
+        service._accumulated.append("nine ten eleven twelve thirteen fourteen fifteen sixteen")
+        service._word_count = 8
+        service._maybe_analyze()
+        assert service._analyzer.analyze.call_count == 1
+        assert len(service._accumulated) == 1
+
+        release.set()
+        service._analysis.result(timeout=5)
+
+    def test_buffer_bounded_and_count_tracks_evictions(
+        self, service: ContentAnalyzerService,
+    ) -> None:
+        cap = service._accumulated.maxlen
+        batch = [
+            ("transcript", {"data": {"text": f"w{i} x{i}"}}) for i in range(cap + 3)
+        ]
+
+        def _drain(*args: Any, **kwargs: Any) -> list[tuple[str, dict[str, Any]]]:
+            service._stop.set()
+            return batch
+
+        service.bus.drain.side_effect = _drain
+        service._maybe_analyze = MagicMock()
+        service._main_loop()
+
+        assert len(service._accumulated) == cap
+        assert service._accumulated[0] == "w3 x3"
+        assert service._word_count == 2 * cap == sum(service._segment_words)
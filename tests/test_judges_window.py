@@ -1,7 +1,7 @@
 """Unit tests for src.viz.judges_window – real-time demo dashboard.
 
 Tests cover:
-    - compute_rms: base64-encoded int16 → RMS float
+    - compute_rms: int16 PCM bytes → RMS float
     - create_app: Flask app factory returns valid app + socketio
     - Index route serves HTML with expected elements
     - SocketIO event emission for each topic type
@@ -13,7 +13,6 @@ ZeroMQ is mocked — no pipeline stages need to be running.
 
 from __future__ import annotations
 
-import base64
 import math
 import threading
 import time
@@ -36,31 +35,31 @@ from src.viz.judges_window import (
 # ---------------------------------------------------------------------------
 
 class TestComputeRms:
-    """compute_rms must decode base64 int16 and return the RMS level."""
+    """compute_rms must read int16 PCM and return the RMS level."""
 
     def test_silence_returns_zero(self) -> None:
         samples = np.zeros(1024, dtype=np.int16)
-        b64 = base64.b64encode(samples.tobytes()).decode("ascii")
-        assert compute_rms(b64) == pytest.approx(0.0, abs=1e-6)
+        pcm = samples.tobytes()
+        assert compute_rms(pcm) == pytest.approx(0.0, abs=1e-6)
 
     def test_known_signal(self) -> None:
         """A constant ±16384 (half-scale int16) signal should give RMS ≈ 0.5."""
         samples = np.full(1024, 16384, dtype=np.int16)
-        b64 = base64.b64encode(samples.tobytes()).decode("ascii")
-        rms = compute_rms(b64)
+        pcm = samples.tobytes()
+        rms = compute_rms(pcm)
         # 16384 / 32768 = 0.5
         assert rms == pytest.approx(0.5, abs=0.01)
 
     def test_full_scale(self) -> None:
         samples = np.full(512, 32767, dtype=np.int16)
-        b64 = base64.b64encode(samples.tobytes()).decode("ascii")
-        rms = compute_rms(b64)
+        pcm = samples.tobytes()
+        rms = compute_rms(pcm)
         assert rms == pytest.approx(1.0, abs=0.01)
 
     def test_returns_float(self) -> None:
         samples = np.zeros(128, dtype=np.int16)
-        b64 = base64.b64encode(samples.tobytes()).decode("ascii")
-        assert isinstance(compute_rms(b64), float)
+        pcm = samples.tobytes()
+        assert isinstance(compute_rms(pcm), float)
 
 
 # ---------------------------------------------------------------------------
@@ -185,25 +184,31 @@ class TestZmqListenerRouting:
     """
 
     @staticmethod
-    def _make_envelope(topic: str, data: dict[str, Any]) -> dict[str, Any]:
-        return {
+    def _make_envelope(
+        topic: str, data: dict[str, Any], binary: bytes | None = None,
+    ) -> dict[str, Any]:
+        envelope = {
             "timestamp": "2026-02-14T12:00:00+00:00",
             "topic": topic,
             "data": data,
         }
+        if binary is not None:
+            envelope["binary"] = binary
+        return envelope
 
     def _run_listener_with_messages(
         self,
-        messages: list[tuple[str, dict[str, Any]]],
+        messages: list[tuple[Any, ...]],
     ) -> MagicMock:
-        """Feed *messages* into zmq_listener and return the mock socketio."""
+        """Feed *messages* — ``(topic, data[, binary])`` — into zmq_listener
+        and return the mock socketio."""
         mock_sio = MagicMock()
         mock_bus = MagicMock()
 
         # receive() returns messages one by one, then raises to exit.
         results = [
-            (topic, self._make_envelope(topic, data))
-            for topic, data in messages
+            (topic, self._make_envelope(topic, *rest))
+            for topic, *rest in messages
         ]
         # Append a KeyboardInterrupt to break the infinite loop.
         mock_bus.receive.side_effect = [*results, KeyboardInterrupt]
@@ -247,12 +252,11 @@ class TestZmqListenerRouting:
     def test_audio_throttled_to_every_5th(self) -> None:
         """Only the 5th, 10th, … audio chunks should trigger an emit."""
         samples = np.zeros(1024, dtype=np.int16)
-        b64 = base64.b64encode(samples.tobytes()).decode("ascii")
-        audio_data = {"samples": b64, "timestamp": "t", "sample_rate": 16000}
+        audio_data = {"timestamp": "t", "sample_rate": 16000}
 
         # Send exactly 5 audio chunks → expect 1 emit.
         mock_sio = self._run_listener_with_messages(
-            [("audio", audio_data)] * 5
+            [("audio", audio_data, samples.tobytes())] * 5
         )
         audio_calls = [
             c for c in mock_sio.emit.call_args_list
@@ -263,11 +267,10 @@ class TestZmqListenerRouting:
     def test_audio_not_emitted_below_interval(self) -> None:
         """Fewer than AUDIO_EMIT_INTERVAL chunks should produce no emit."""
         samples = np.zeros(1024, dtype=np.int16)
-        b64 = base64.b64encode(samples.tobytes()).decode("ascii")
-        audio_data = {"samples": b64, "timestamp": "t", "sample_rate": 16000}
+        audio_data = {"timestamp": "t", "sample_rate": 16000}
 
         mock_sio = self._run_listener_with_messages(
-            [("audio", audio_data)] * 4
+            [("audio", audio_data, samples.tobytes())] * 4
         )
         audio_calls = [
             c for c in mock_sio.emit.call_args_list
@@ -278,11 +281,10 @@ class TestZmqListenerRouting:
     def test_audio_emit_contains_rms(self) -> None:
         """The emitted audio_level event must include an 'rms' key."""
         samples = np.full(1024, 16384, dtype=np.int16)
-        b64 = base64.b64encode(samples.tobytes()).decode("ascii")
-        audio_data = {"samples": b64, "timestamp": "t", "sample_rate": 16000}
+        audio_data = {"timestamp": "t", "sample_rate": 16000}
 
         mock_sio = self._run_listener_with_messages(
-            [("audio", audio_data)] * 5
+            [("audio", audio_data, samples.tobytes())] * 5
         )
         audio_calls = [
             c for c in mock_sio.emit.call_args_list
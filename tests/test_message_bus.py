@@ -3,28 +3,53 @@
 Tests cover:
     - Port constant values
     - MessageBus singleton zmq.Context behavior
-    - Publisher / Subscriber socket creation
+    - Publisher / Subscriber socket creation and socket options
     - Publish / Receive round-trip with JSON validation
     - Receive timeout returns None
+    - drain() batch reads
+    - tcp / ipc / inproc endpoints
+    - Envelope serialisation (orjson and stdlib fallback)
 """
 
 import json
+import socket
 import time
 import threading
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
+import numpy as np
 import pytest
 import zmq
 
+from src.core import message_bus
 from src.core.message_bus import (
     AUDIO_PORT,
     TRANSCRIPT_PORT,
     STRESS_PORT,
     TACTIC_PORT,
+    IO_THREADS,
+    PUB_LINGER_MS,
+    SOCKET_HWM,
     MessageBus,
 )
 
 
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _free_port() -> int:
+    """A loopback TCP port nothing is bound to right now.
+
+    Each test binds its own: publishers linger on close, so rebinding a
+    fixed port can race the previous test's socket teardown.
+    """
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
 # ---------------------------------------------------------------------------
 # Port constants
 # ---------------------------------------------------------------------------
@@ -70,6 +95,9 @@ class TestMessageBusInit:
         bus_b = MessageBus()
         assert bus_a.context is bus_b.context
 
+    def test_context_io_threads(self) -> None:
+        assert MessageBus().context.get(zmq.IO_THREADS) == IO_THREADS
+
 
 # ---------------------------------------------------------------------------
 # Socket creation
@@ -83,7 +111,7 @@ class TestSocketCreation:
         self.bus = MessageBus()
 
     def test_create_publisher_returns_pub_socket(self) -> None:
-        pub = self.bus.create_publisher(port=6100)
+        pub = self.bus.create_publisher(port=_free_port())
         try:
             assert pub.type == zmq.PUB
         finally:
@@ -91,9 +119,10 @@ class TestSocketCreation:
 
     def test_create_subscriber_returns_sub_socket(self) -> None:
         # Need a publisher first so the port is bound.
-        pub = self.bus.create_publisher(port=6101)
+        port = _free_port()
+        pub = self.bus.create_publisher(port=port)
         try:
-            sub = self.bus.create_subscriber(ports=[6101])
+            sub = self.bus.create_subscriber(ports=[port])
             try:
                 assert sub.type == zmq.SUB
             finally:
@@ -101,10 +130,45 @@ class TestSocketCreation:
         finally:
             pub.close()
 
+    def test_publisher_socket_options(self) -> None:
+        pub = self.bus.create_publisher(port=_free_port())
+        try:
+            assert pub.getsockopt(zmq.SNDHWM) == SOCKET_HWM
+            assert pub.getsockopt(zmq.LINGER) == PUB_LINGER_MS
+        finally:
+            pub.close()
+
+    def test_subscriber_socket_options(self) -> None:
+        port = _free_port()
+        pub = self.bus.create_publisher(port=port)
+        try:
+            sub = self.bus.create_subscriber(ports=[port])
+            try:
+                assert sub.getsockopt(zmq.RCVHWM) == SOCKET_HWM
+                assert sub.getsockopt(zmq.LINGER) == 0
+            finally:
+                sub.close()
+        finally:
+            pub.close()
+
+    def test_custom_hwm(self) -> None:
+        port = _free_port()
+        pub = self.bus.create_publisher(port=port, hwm=5000)
+        try:
+            sub = self.bus.create_subscriber(ports=[port], hwm=5000)
+            try:
+                assert pub.getsockopt(zmq.SNDHWM) == 5000
+                assert sub.getsockopt(zmq.RCVHWM) == 5000
+            finally:
+                sub.close()
+        finally:
+            pub.close()
+
     def test_subscriber_with_topic_filter(self) -> None:
-        pub = self.bus.create_publisher(port=6102)
+        port = _free_port()
+        pub = self.bus.create_publisher(port=port)
         try:
-            sub = self.bus.create_subscriber(ports=[6102], topics=["audio"])
+            sub = self.bus.create_subscriber(ports=[port], topics=["audio"])
             try:
                 assert sub.type == zmq.SUB
             finally:
@@ -120,14 +184,12 @@ class TestSocketCreation:
 class TestPubSubRoundTrip:
     """Messages must survive a publish -> receive round-trip intact."""
 
-    # Use a unique port range to avoid collisions with other test classes.
-    PORT = 6200
-
     @pytest.fixture(autouse=True)
     def _sockets(self) -> None:
+        port = _free_port()
         self.bus = MessageBus()
-        self.pub = self.bus.create_publisher(port=self.PORT)
-        self.sub = self.bus.create_subscriber(ports=[self.PORT])
+        self.pub = self.bus.create_publisher(port=port)
+        self.sub = self.bus.create_subscriber(ports=[port])
         # Allow the ZeroMQ "slow joiner" handshake to complete.
         time.sleep(0.3)
         yield
@@ -187,20 +249,26 @@ class TestReceiveTimeout:
 
     @pytest.fixture(autouse=True)
     def _sockets(self) -> None:
+        port = _free_port()
         self.bus = MessageBus()
-        self.pub = self.bus.create_publisher(port=6300)
-        self.sub = self.bus.create_subscriber(ports=[self.PORT])
+        self.pub = self.bus.create_publisher(port=port)
+        self.sub = self.bus.create_subscriber(ports=[port])
         yield
         self.sub.close()
         self.pub.close()
 
-    PORT = 6300
-
     def test_returns_none_on_timeout(self) -> None:
         # No messages published — should return None quickly.
         result = self.bus.receive(self.sub, timeout_ms=200)
         assert result is None
 
+    def test_timeout_bounds_the_wait(self) -> None:
+        start = time.monotonic()
+        assert self.bus.receive(self.sub, timeout_ms=50) is None
+        assert self.bus.drain(self.sub, timeout_ms=50) == []
+        assert time.monotonic() - start < 1.0
+        assert self.sub.getsockopt(zmq.RCVTIMEO) == 50
+
 
 # ---------------------------------------------------------------------------
 # Multi-message delivery
@@ -209,13 +277,12 @@ class TestReceiveTimeout:
 class TestMultiMessage:
     """Multiple messages should all be delivered in order."""
 
-    PORT = 6400
-
     @pytest.fixture(autouse=True)
     def _sockets(self) -> None:
+        port = _free_port()
         self.bus = MessageBus()
-        self.pub = self.bus.create_publisher(port=self.PORT)
-        self.sub = self.bus.create_subscriber(ports=[self.PORT])
+        self.pub = self.bus.create_publisher(port=port)
+        self.sub = self.bus.create_subscriber(ports=[port])
         time.sleep(0.3)
         yield
         self.sub.close()
@@ -236,3 +303,142 @@ class TestMultiMessage:
         assert len(received) == count
         for i, msg in enumerate(received):
             assert msg["data"]["seq"] == i
+
+
+# ---------------------------------------------------------------------------
+# Batch drain
+# ---------------------------------------------------------------------------
+
+class TestDrain:
+    """drain() must return every queued message after a single poll."""
+
+    # Bound once for the class, so the sockets stay connected across tests.
+    @pytest.fixture(autouse=True, scope="class")
+    @classmethod
+    def _sockets(cls) -> None:
+        port = _free_port()
+        cls.bus = MessageBus()
+        cls.pub = cls.bus.create_publisher(port=port)
+        cls.sub = cls.bus.create_subscriber(ports=[port])
+        time.sleep(0.3)
+        yield
+        cls.sub.close()
+        cls.pub.close()
+
+    def test_empty_on_timeout(self) -> None:
+        assert self.bus.drain(self.sub, timeout_ms=50) == []
+
+    def test_returns_whole_burst_in_order(self) -> None:
+        for i in range(5):
+            self.bus.publish(self.pub, topic="transcript", data={"seq": i})
+        time.sleep(0.2)
+
+        batch = self.bus.drain(self.sub, timeout_ms=1000)
+        assert [t for t, _ in batch] == ["transcript"] * 5
+        assert all(t is batch[0][0] for t, _ in batch)  # decoded once, then cached
+        assert [m["data"]["seq"] for _, m in batch] == list(range(5))
+
+    def test_max_messages_caps_batch(self) -> None:
+        for i in range(4):
+            self.bus.publish(self.pub, topic="audio", data={"seq": i})
+        time.sleep(0.2)
+
+        first = self.bus.drain(self.sub, timeout_ms=1000, max_messages=3)
+        rest = self.bus.drain(self.sub, timeout_ms=1000)
+        assert [m["data"]["seq"] for _, m in first] == [0, 1, 2]
+        assert [m["data"]["seq"] for _, m in rest] == [3]
+
+    def test_explicit_timestamp_used_for_envelope(self) -> None:
+        ts = "2026-01-02T03:04:05.000006+00:00"
+        self.bus.publish(self.pub, "stress", {"timestamp": ts}, timestamp=ts)
+        batch = self.bus.drain(self.sub, timeout_ms=1000)
+        assert batch[0][1]["timestamp"] == ts
+
+    def test_binary_frame_round_trip(self) -> None:
+        pcm = np.arange(-512, 512, dtype=np.int16)
+        self.bus.publish(self.pub, "audio", {"sample_rate": 16000}, binary=pcm.tobytes())
+        self.bus.publish(self.pub, "audio", {"sample_rate": 16000})
+        time.sleep(0.2)
+        batch = self.bus.drain(self.sub, timeout_ms=1000)
+        assert np.array_equal(np.frombuffer(batch[0][1]["binary"], dtype=np.int16), pcm)
+        assert batch[0][1]["data"] == {"sample_rate": 16000}
+        assert "binary" not in batch[1][1]
+
+
+# ---------------------------------------------------------------------------
+# Transports
+# ---------------------------------------------------------------------------
+
+class TestTransport:
+    """Ports map onto ipc/inproc endpoints as well as TCP loopback."""
+
+    @pytest.mark.parametrize("transport", ["ipc", "inproc"])
+    def test_round_trip(self, transport: str) -> None:
+        bus = MessageBus()
+        pub = bus.create_publisher(port=6600, transport=transport)
+        sub = bus.create_subscriber(ports=[6600], transport=transport)
+        try:
+            assert pub.getsockopt_string(zmq.LAST_ENDPOINT).startswith(f"{transport}://")
+            bus.publish(pub, "transcript", {"text": "hello"})
+            result = bus.receive(sub, timeout_ms=2000)
+            assert result is not None
+            assert result[1]["data"] == {"text": "hello"}
+        finally:
+            sub.close()
+            pub.close()
+
+    def test_unknown_transport_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            MessageBus().create_publisher(port=6601, transport="udp")
+
+
+# ---------------------------------------------------------------------------
+# Envelope serialisation
+# ---------------------------------------------------------------------------
+
+class TestSerialisation:
+    """Body frames must be UTF-8 JSON bytes whichever encoder is active."""
+
+    def test_dumps_is_plain_json_bytes(self) -> None:
+        payload = {"text": "héllo", "score": 0.5, "ok": True, "none": None}
+        raw = message_bus._dumps(payload)
+        assert isinstance(raw, bytes)
+        assert json.loads(raw.decode("utf-8")) == payload
+        assert message_bus._loads(raw) == payload
+
+    @pytest.mark.skipif(message_bus.orjson is None, reason="orjson not installed")
+    def test_numpy_values_serialise(self) -> None:
+        raw = message_bus._dumps({"v": np.float32(0.5), "a": np.arange(3)})
+        assert json.loads(raw) == {"v": 0.5, "a": [0, 1, 2]}
+
+    def test_dataclass_payload_serialises_as_dict(self) -> None:
+        @dataclass(slots=True)
+        class _Payload:
+            score: float
+            labels: list[str]
+
+        raw = message_bus._dumps({"data": _Payload(0.5, ["a"])})
+        assert json.loads(raw) == {"data": {"score": 0.5, "labels": ["a"]}}
+
+    def test_stdlib_fallback_round_trip(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(
+            message_bus, "_dumps",
+            lambda obj: json.dumps(obj, default=message_bus._json_default).encode("utf-8"),
+        )
+        monkeypatch.setattr(message_bus, "_loads", json.loads)
+        bus = MessageBus()
+        port = _free_port()
+        pub = bus.create_publisher(port=port)
+        try:
+            sub = bus.create_subscriber(ports=[port])
+            try:
+                time.sleep(0.3)
+                bus.publish(pub, "audio", {"seq": 1})
+                result = bus.receive(sub, timeout_ms=2000)
+                assert result is not None
+                assert result[1]["data"] == {"seq": 1}
+                datetime.fromisoformat(result[1]["timestamp"])
+            finally:
+                sub.close()
+        finally:
+            pub.close()
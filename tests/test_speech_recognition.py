@@ -7,7 +7,7 @@ NumPy operations.
 Tests cover:
     - ASRConfig dataclass defaults and overrides
     - SpeechRecognizer construction
-    - _decode_audio: base64 int16 → float32 normalised
+    - _decode_audio: int16 PCM bytes → float32 normalised
     - _transcribe: mocked WhisperModel returns expected structure
     - Buffer accumulation and threshold logic
     - Published message format on the wire
@@ -17,7 +17,6 @@ Tests cover:
 
 from __future__ import annotations
 
-import base64
 import time
 import threading
 from datetime import datetime, timezone
@@ -27,37 +26,42 @@ from unittest.mock import MagicMock, patch
 import numpy as np
 import pytest
 
-from src.core.message_bus import AUDIO_PORT, TRANSCRIPT_PORT, MessageBus
-from src.core.speech_recognition import ASRConfig, SpeechRecognizer
+from src.core.message_bus import AUDIO_HWM, AUDIO_PORT, TRANSCRIPT_PORT, MessageBus
+from src.core.speech_recognition import _BUFFER_CAPACITY_S, ASRConfig, SpeechRecognizer
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _make_audio_payload(
-    samples: np.ndarray | None = None,
-    sample_rate: int = 16000,
-) -> dict[str, Any]:
+def _make_audio_payload(sample_rate: int = 16000) -> dict[str, Any]:
     """Build an audio ``data`` dict matching the audio_capture wire format.
 
+    The samples themselves go in the message's binary frame.
+
     Parameters
     ----------
-    samples:
-        1-D int16 array.  If ``None``, generates 1024 samples of silence.
     sample_rate:
         Sample rate to include in the payload.
     """
-    if samples is None:
-        samples = np.zeros(1024, dtype=np.int16)
-    raw = samples.tobytes()
     return {
-        "samples": base64.b64encode(raw).decode("ascii"),
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "sample_rate": sample_rate,
     }
 
 
+def _pcm(samples: np.ndarray | None = None) -> bytes:
+    """int16 PCM bytes for a binary frame; 1024 samples of silence by default."""
+    if samples is None:
+        samples = np.zeros(1024, dtype=np.int16)
+    return samples.tobytes()
+
+
+def _tone(n: int = 16000) -> np.ndarray:
+    """float32 440 Hz tone at 16 kHz, loud enough to pass the silence gate."""
+    return (0.1 * np.sin(2 * np.pi * 440 * np.arange(n) / 16000)).astype(np.float32)
+
+
 # ---------------------------------------------------------------------------
 # ASRConfig dataclass
 # ---------------------------------------------------------------------------
@@ -77,6 +81,10 @@ class TestASRConfig:
         cfg = ASRConfig()
         assert cfg.min_audio_length == 2.5
 
+    def test_default_compute_type(self) -> None:
+        cfg = ASRConfig()
+        assert cfg.compute_type == "int8_float16"
+
     def test_custom_values(self) -> None:
         cfg = ASRConfig(model_size="tiny", language="es", min_audio_length=2.5)
         assert cfg.model_size == "tiny"
@@ -114,6 +122,11 @@ class TestSpeechRecognizerInit:
         sr = SpeechRecognizer(config=ASRConfig(), bus=MessageBus())
         mock_model_cls.assert_called_once()
 
+    @patch("src.core.speech_recognition.WhisperModel")
+    def test_model_uses_configured_compute_type(self, mock_model_cls: MagicMock) -> None:
+        SpeechRecognizer(config=ASRConfig(compute_type="float16"), bus=MessageBus())
+        assert mock_model_cls.call_args.kwargs["compute_type"] == "float16"
+
 
 # ---------------------------------------------------------------------------
 # _normalize_audio
@@ -158,27 +171,25 @@ class TestNormalizeAudio:
 # ---------------------------------------------------------------------------
 
 class TestDecodeAudio:
-    """_decode_audio must convert base64-encoded int16 → float32 in [-1, 1]."""
+    """_decode_audio must convert int16 PCM bytes → float32 in [-1, 1]."""
 
     @patch("src.core.speech_recognition.WhisperModel")
     def test_output_dtype_is_float32(self, mock_model_cls: MagicMock) -> None:
         sr = SpeechRecognizer(config=ASRConfig(), bus=MessageBus())
-        payload = _make_audio_payload()
-        result = sr._decode_audio(payload)
+        result = sr._decode_audio(_pcm())
         assert result.dtype == np.float32
 
     @patch("src.core.speech_recognition.WhisperModel")
     def test_output_is_1d(self, mock_model_cls: MagicMock) -> None:
         sr = SpeechRecognizer(config=ASRConfig(), bus=MessageBus())
-        payload = _make_audio_payload()
-        result = sr._decode_audio(payload)
+        result = sr._decode_audio(_pcm())
         assert result.ndim == 1
 
     @patch("src.core.speech_recognition.WhisperModel")
     def test_length_matches_input(self, mock_model_cls: MagicMock) -> None:
         samples = np.arange(512, dtype=np.int16)
         sr = SpeechRecognizer(config=ASRConfig(), bus=MessageBus())
-        result = sr._decode_audio(_make_audio_payload(samples=samples))
+        result = sr._decode_audio(_pcm(samples))
         assert len(result) == 512
 
     @patch("src.core.speech_recognition.WhisperModel")
@@ -186,7 +197,7 @@ class TestDecodeAudio:
         """Full-scale int16 should map to approximately ±1.0."""
         samples = np.array([32767, -32768, 0], dtype=np.int16)
         sr = SpeechRecognizer(config=ASRConfig(), bus=MessageBus())
-        result = sr._decode_audio(_make_audio_payload(samples=samples))
+        result = sr._decode_audio(_pcm(samples))
         assert result[0] == pytest.approx(1.0, abs=1e-4)
         assert result[1] == pytest.approx(-1.0, abs=1e-4)
         assert result[2] == pytest.approx(0.0, abs=1e-4)
@@ -197,11 +208,20 @@ class TestDecodeAudio:
         rng = np.random.default_rng(99)
         original_int16 = rng.integers(-20000, 20000, size=2048, dtype=np.int16)
         sr = SpeechRecognizer(config=ASRConfig(), bus=MessageBus())
-        decoded = sr._decode_audio(_make_audio_payload(samples=original_int16))
+        decoded = sr._decode_audio(_pcm(original_int16))
         # Re-quantise back to int16 for comparison.
         recovered = (decoded * 32768.0).astype(np.int16)
         np.testing.assert_array_equal(recovered, original_int16)
 
+    @patch("src.core.speech_recognition.WhisperModel")
+    def test_decodes_into_buffer(self, mock_model_cls: MagicMock) -> None:
+        """Decoding into a reserved buffer slice matches a fresh decode."""
+        samples = np.array([32767, -32768, 0, 1234], dtype=np.int16)
+        sr = SpeechRecognizer(config=ASRConfig(), bus=MessageBus())
+        sr._decode_audio(_pcm(samples), out=sr._reserve(len(samples)))
+        np.testing.assert_array_equal(sr._flush_buffer(), sr._decode_audio(_pcm(samples)))
+        assert sr._buffered == 0
+
 
 # ---------------------------------------------------------------------------
 # _transcribe
@@ -226,8 +246,7 @@ class TestTranscribe:
         mock_instance.transcribe.return_value = ([mock_segment], mock_info)
 
         sr = SpeechRecognizer(config=ASRConfig(), bus=MessageBus())
-        audio = np.zeros(16000, dtype=np.float32)
-        result = sr._transcribe(audio)
+        result = sr._transcribe(_tone())
 
         assert "text" in result
         assert "Hello world" in result["text"]
@@ -247,7 +266,7 @@ class TestTranscribe:
         mock_instance.transcribe.return_value = ([mock_segment], mock_info)
 
         sr = SpeechRecognizer(config=ASRConfig(), bus=MessageBus())
-        result = sr._transcribe(np.zeros(16000, dtype=np.float32))
+        result = sr._transcribe(_tone())
 
         assert "segments" in result
         assert isinstance(result["segments"], list)
@@ -264,7 +283,7 @@ class TestTranscribe:
         mock_instance.transcribe.return_value = ([], mock_info)
 
         sr = SpeechRecognizer(config=ASRConfig(), bus=MessageBus())
-        result = sr._transcribe(np.zeros(16000, dtype=np.float32))
+        result = sr._transcribe(_tone())
 
         assert result["language"] == "en"
 
@@ -278,11 +297,30 @@ class TestTranscribe:
         mock_instance.transcribe.return_value = ([], mock_info)
 
         sr = SpeechRecognizer(config=ASRConfig(), bus=MessageBus())
-        result = sr._transcribe(np.zeros(16000, dtype=np.float32))
+        result = sr._transcribe(_tone())
 
         assert result["text"] == ""
         assert result["segments"] == []
 
+    @patch("src.core.speech_recognition.WhisperModel")
+    def test_silence_skips_model(self, mock_model_cls: MagicMock) -> None:
+        sr = SpeechRecognizer(config=ASRConfig(), bus=MessageBus())
+        result = sr._transcribe(np.full(16000, 0.001, dtype=np.float32))
+
+        mock_model_cls.return_value.transcribe.assert_not_called()
+        assert result == {"text": "", "segments": [], "language": "en"}
+
+    @patch("src.core.speech_recognition.WhisperModel")
+    def test_zero_threshold_transcribes_silence(self, mock_model_cls: MagicMock) -> None:
+        mock_info = MagicMock()
+        mock_info.language = "en"
+        mock_model_cls.return_value.transcribe.return_value = ([], mock_info)
+
+        sr = SpeechRecognizer(config=ASRConfig(silence_rms=0.0), bus=MessageBus())
+        sr._transcribe(np.zeros(16000, dtype=np.float32))
+
+        mock_model_cls.return_value.transcribe.assert_called_once()
+
 
 # ---------------------------------------------------------------------------
 # Buffer accumulation logic
@@ -294,7 +332,7 @@ class TestBufferAccumulation:
     @patch("src.core.speech_recognition.WhisperModel")
     def test_buffer_starts_empty(self, mock_model_cls: MagicMock) -> None:
         sr = SpeechRecognizer(config=ASRConfig(), bus=MessageBus())
-        assert len(sr._buffer) == 0
+        assert sr._buffered == 0
 
     @patch("src.core.speech_recognition.WhisperModel")
     def test_buffer_length_calculation(self, mock_model_cls: MagicMock) -> None:
@@ -304,7 +342,7 @@ class TestBufferAccumulation:
             bus=MessageBus(),
         )
         # Append 8000 samples at 16 kHz = 0.5 seconds.
-        sr._buffer = list(np.zeros(8000, dtype=np.float32))
+        sr._append(np.zeros(8000, dtype=np.float32))
         assert sr.buffer_seconds == pytest.approx(0.5, abs=0.01)
 
     @patch("src.core.speech_recognition.WhisperModel")
@@ -313,7 +351,7 @@ class TestBufferAccumulation:
             config=ASRConfig(min_audio_length=1.0),
             bus=MessageBus(),
         )
-        sr._buffer = list(np.zeros(8000, dtype=np.float32))  # 0.5 s
+        sr._append(np.zeros(8000, dtype=np.float32))  # 0.5 s
         assert not sr._buffer_ready()
 
     @patch("src.core.speech_recognition.WhisperModel")
@@ -322,9 +360,67 @@ class TestBufferAccumulation:
             config=ASRConfig(min_audio_length=1.0),
             bus=MessageBus(),
         )
-        sr._buffer = list(np.zeros(16000, dtype=np.float32))  # 1.0 s
+        sr._append(np.zeros(16000, dtype=np.float32))  # 1.0 s
         assert sr._buffer_ready()
 
+    @patch("src.core.speech_recognition.WhisperModel")
+    def test_flush_returns_chunks_in_order_and_grows(self, mock_model_cls: MagicMock) -> None:
+        sr = SpeechRecognizer(config=ASRConfig(), bus=MessageBus())
+        sr._sample_rate = 48000  # cap now exceeds the 16 kHz allocation
+        chunks = [np.full(1024, i, dtype=np.float32) for i in range(3)]
+        chunks.append(np.ones(len(sr._buffer), dtype=np.float32))  # overfills
+        for chunk in chunks:
+            sr._append(chunk)
+
+        audio = sr._flush_buffer()
+        np.testing.assert_array_equal(audio, np.concatenate(chunks))
+        assert sr._buffered == 0
+        sr._append(chunks[0])
+        np.testing.assert_array_equal(sr._flush_buffer(), chunks[0])
+
+    @patch("src.core.speech_recognition.WhisperModel")
+    def test_backlog_keeps_newest_audio_up_to_cap(self, mock_model_cls: MagicMock) -> None:
+        sr = SpeechRecognizer(config=ASRConfig(), bus=MessageBus())
+        cap = 16000 * _BUFFER_CAPACITY_S
+        sr._append(np.zeros(cap, dtype=np.float32))
+        sr._append(np.ones(1024, dtype=np.float32))
+
+        audio = sr._flush_buffer()
+        assert len(audio) == cap
+        np.testing.assert_array_equal(audio[-1024:], np.ones(1024, dtype=np.float32))
+
+    @patch("src.core.speech_recognition.WhisperModel")
+    def test_flushed_view_survives_next_fill(self, mock_model_cls: MagicMock) -> None:
+        """The window being transcribed must not be overwritten by new audio."""
+        sr = SpeechRecognizer(config=ASRConfig(), bus=MessageBus())
+        sr._append(np.ones(1024, dtype=np.float32))
+        audio = sr._flush_buffer()
+
+        sr._append(np.full(2048, 2.0, dtype=np.float32))
+        np.testing.assert_array_equal(audio, np.ones(1024, dtype=np.float32))
+        assert not np.shares_memory(audio, sr._buffer)
+
+    @patch("src.core.speech_recognition.WhisperModel")
+    def test_message_without_pcm_frame_skipped(self, mock_model_cls: MagicMock) -> None:
+        """A two-frame audio message (old publisher) is dropped, not fatal."""
+        bus = MagicMock()
+        sr = SpeechRecognizer(config=ASRConfig(), bus=bus)
+        messages = iter([
+            ("audio", {"data": {**_make_audio_payload(), "samples": "AAAA"}}),
+            ("audio", {"data": _make_audio_payload(), "binary": _pcm()}),
+        ])
+
+        def receive(*args: Any, **kwargs: Any) -> tuple[str, dict[str, Any]] | None:
+            result = next(messages, None)
+            if result is None:
+                sr._stop_event.set()
+            return result
+
+        bus.receive.side_effect = receive
+        sr._main_loop()
+        assert sr._buffered == 1024
+        assert sr._warned_no_pcm
+
 
 # ---------------------------------------------------------------------------
 # Start / stop lifecycle
@@ -364,6 +460,108 @@ class TestStartStop:
         # Restore (just in case).
         bus.receive = bus_receive_orig
 
+    @patch("src.core.speech_recognition.WhisperModel")
+    def test_restart_after_stop(self, mock_model_cls: MagicMock) -> None:
+        """A stopped recognizer can start again and keeps transcribing."""
+        bus = MagicMock()
+        sr = SpeechRecognizer(config=ASRConfig(min_audio_length=0.1), bus=bus)
+        sr._transcribe = MagicMock(return_value={"text": "hi", "segments": [], "language": "en"})
+        envelope = {"data": _make_audio_payload(), "binary": _pcm()}
+        received = 0
+
+        def receive(*args: Any, **kwargs: Any) -> tuple[str, dict[str, Any]] | None:
+            nonlocal received
+            received += 1
+            if received % 3 == 0:  # two chunks (one window) per run
+                sr.stop()
+                return None
+            return "audio", envelope
+
+        bus.receive.side_effect = receive
+        sr.start()
+        sr.start()
+        sr.close()
+
+        assert sr._transcribe.call_count == 2
+        assert bus.publish.call_count == 2
+
+    @patch("src.core.speech_recognition.WhisperModel")
+    def test_audio_subscriber_uses_audio_hwm(self, mock_model_cls: MagicMock) -> None:
+        bus = MagicMock()
+        sr = SpeechRecognizer(config=ASRConfig(), bus=bus)
+        sr._main_loop = MagicMock()  # return straight away
+
+        sr.start()
+        assert bus.create_subscriber.call_args.kwargs["hwm"] == AUDIO_HWM
+
+    @patch("src.core.speech_recognition.WhisperModel")
+    def test_keeps_buffering_while_transcribing(self, mock_model_cls: MagicMock) -> None:
+        """A slow transcription must not block intake or start a second window."""
+        bus = MagicMock()
+        sr = SpeechRecognizer(config=ASRConfig(min_audio_length=0.05), bus=bus)
+        release = threading.Event()
+
+        def slow_transcribe(audio: np.ndarray) -> dict[str, Any]:
+            release.wait(timeout=5)
+            return {"text": "hi", "segments": [], "language": "en"}
+
+        sr._transcribe = MagicMock(side_effect=slow_transcribe)
+        envelope = {"data": _make_audio_payload(), "binary": _pcm()}  # 64 ms
+        received = 0
+
+        def receive(*args: Any, **kwargs: Any) -> tuple[str, dict[str, Any]] | None:
+            nonlocal received
+            received += 1
+            if received > 3:
+                sr._stop_event.set()
+                return None
+            return "audio", envelope
+
+        bus.receive.side_effect = receive
+        sr._main_loop()  # returns while the first window is still on the "GPU"
+
+        assert sr._transcribe.call_count == 1
+        assert sr._buffered == 2 * 1024
+        release.set()
+        sr.close()
+        assert bus.publish.call_count == 1
+
+    @patch("src.core.speech_recognition._BUFFER_CAPACITY_S", 1)
+    @patch("src.core.speech_recognition.WhisperModel")
+    def test_slow_transcription_caps_next_window(self, mock_model_cls: MagicMock) -> None:
+        """Audio piling up behind a blocked Whisper pass must stay within the cap."""
+        bus = MagicMock()
+        sr = SpeechRecognizer(config=ASRConfig(min_audio_length=0.05), bus=bus)
+        release = threading.Event()
+        window_lengths: list[int] = []
+
+        def slow_transcribe(audio: np.ndarray) -> dict[str, Any]:
+            window_lengths.append(len(audio))
+            release.wait(timeout=5)
+            return {"text": "hi", "segments": [], "language": "en"}
+
+        sr._transcribe = MagicMock(side_effect=slow_transcribe)
+        envelope = {"data": _make_audio_payload(), "binary": _pcm()}
+        received = 0
+
+        def receive(*args: Any, **kwargs: Any) -> tuple[str, dict[str, Any]] | None:
+            nonlocal received
+            received += 1
+            if received == 40:  # ~2.6 s queued behind the first window
+                release.set()
+                sr._inflight.result(timeout=5)
+            elif received > 40:
+                sr._stop_event.set()
+                return None
+            return "audio", envelope
+
+        bus.receive.side_effect = receive
+        sr._main_loop()
+        sr.close()
+
+        assert len(window_lengths) == 2
+        assert window_lengths[1] == 16000  # 1 s cap, oldest audio dropped
+
 
 # ---------------------------------------------------------------------------
 # End-to-end on the wire (mocked model, real ZeroMQ)
@@ -415,8 +613,10 @@ class TestEndToEndWire:
         # Publish enough audio to cross the 0.5 s threshold.
         # 16000 * 0.5 = 8000 samples.  Each chunk = 1024 → need ~8 chunks.
         for _ in range(10):
-            samples = np.zeros(1024, dtype=np.int16)
-            bus.publish(audio_pub, topic="audio", data=_make_audio_payload(samples))
+            samples = np.full(1024, 3000, dtype=np.int16)  # above the silence gate
+            bus.publish(
+                audio_pub, topic="audio", data=_make_audio_payload(), binary=_pcm(samples),
+            )
             time.sleep(0.02)
 
         # Wait for a transcript.
@@ -434,7 +634,8 @@ class TestEndToEndWire:
         assert "Test transcript" in envelope["data"]["text"]
         assert "segments" in envelope["data"]
         assert "language" in envelope["data"]
-        assert "timestamp" in envelope["data"]
+        assert envelope["data"]["timestamp"] == envelope["timestamp"]
+        datetime.fromisoformat(envelope["timestamp"])
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,263 @@
+"""Unit tests for src.core.stress_detector – wav2vec2 vocal-stress detection.
+
+Hardware- and network-independent: the HuggingFace processor and emotion
+model are mocked, with a real ``Wav2Vec2FeatureExtractor`` (built from
+defaults, no download) standing in for the processor's feature extractor.
+Buffering uses real NumPy operations.
+
+Tests cover:
+    - start / stop / restart lifecycle
+    - Fixed-window flush with carry-over
+    - Backlog bound while inference is behind
+    - Audio messages without a PCM frame are skipped
+    - Sample-rate validation against the model's rate
+    - CUDA graphs share one memory pool
+    - Inline normalisation matches Wav2Vec2FeatureExtractor
+"""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+import torch
+from transformers import Wav2Vec2FeatureExtractor
+
+from src.core.stress_detector import _MAX_BATCH, StressConfig, StressDetector
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _make_detector(**config: object) -> StressDetector:
+    """Build a CPU StressDetector with mocked processor and model.
+
+    The model returns fixed logits, one row per input row.
+    """
+    with patch("src.core.stress_detector.Wav2Vec2Processor") as processor_cls, \
+            patch("src.core.stress_detector._EmotionModel") as model_cls:
+        processor_cls.from_pretrained.return_value.feature_extractor = (
+            Wav2Vec2FeatureExtractor(do_normalize=True)
+        )
+        model = model_cls.from_pretrained.return_value.to.return_value
+        model.side_effect = lambda x: (None, torch.tensor([[0.5, 0.2, 0.3]] * x.shape[0]))
+        config.setdefault("quantize_cpu", False)
+        return StressDetector(config=StressConfig(device="cpu", **config), bus=MagicMock())
+
+
+# ---------------------------------------------------------------------------
+# Lifecycle
+# ---------------------------------------------------------------------------
+
+class TestLifecycle:
+    """start() blocks until stop(); the detector can be started again."""
+
+    def test_restart_after_stop(self) -> None:
+        det = _make_detector(min_audio_length=0.1)  # 1600-sample windows
+        reading = {"arousal": 0.5, "valence": 0.2, "dominance": 0.3, "confidence": 0.9}
+        det._predict_batch = MagicMock(side_effect=lambda w: [reading] * len(w))
+        envelope = {"data": {"sample_rate": 16000}, "binary": np.zeros(1024, dtype=np.int16).tobytes()}
+        received = 0
+
+        def receive(*args: Any, **kwargs: Any) -> Any:
+            nonlocal received
+            received += 1
+            if received % 3 == 0:  # two chunks (one window) per run
+                det.stop()
+                return None
+            return "audio", envelope
+
+        det.bus.receive.side_effect = receive
+        det.start()
+        det.start()
+        det.close()
+
+        assert det._predict_batch.call_count == 2
+        assert det.bus.publish.call_count == 2
+
+
+# ---------------------------------------------------------------------------
+# Buffer management
+# ---------------------------------------------------------------------------
+
+class TestBuffer:
+    """Windows are fixed-length; backlog is bounded to the newest windows."""
+
+    def test_flush_carries_remainder_into_next_window(self) -> None:
+        det = _make_detector(min_audio_length=0.1)  # 1600-sample windows
+        n = det.window_samples
+        det._reserve(n + 100)[:] = np.arange(n + 100, dtype=np.float32)
+
+        window = det._flush_buffer(n)
+        np.testing.assert_array_equal(window, np.arange(n, dtype=np.float32))
+        assert det._buffered == 100
+        np.testing.assert_array_equal(
+            det._flush_buffer(), np.arange(n, n + 100, dtype=np.float32),
+        )
+
+    def test_backlog_keeps_only_newest_windows(self) -> None:
+        det = _make_detector(min_audio_length=0.1)
+        n = det.window_samples
+        total = (_MAX_BATCH + 3) * n + 50
+        for start in range(0, total, 1024):
+            size = min(1024, total - start)
+            det._reserve(size)[:] = np.arange(start, start + size, dtype=np.float32)
+
+        assert det._buffered == _MAX_BATCH * n
+        np.testing.assert_array_equal(
+            det._flush_buffer(),
+            np.arange(total - _MAX_BATCH * n, total, dtype=np.float32),
+        )
+
+
+# ---------------------------------------------------------------------------
+# Wire format
+# ---------------------------------------------------------------------------
+
+class TestWireFormat:
+    """Samples arrive in the message's binary frame."""
+
+    def test_message_without_pcm_frame_skipped(self) -> None:
+        """A two-frame audio message (old publisher) is dropped, not fatal."""
+        det = _make_detector()
+        messages = iter([
+            ("audio", {"data": {"sample_rate": 16000, "samples": "AAAA"}}),
+            ("audio", {"data": {"sample_rate": 16000},
+                       "binary": np.zeros(1024, dtype=np.int16).tobytes()}),
+        ])
+
+        def receive(*args: Any, **kwargs: Any) -> Any:
+            result = next(messages, None)
+            if result is None:
+                det._stop_event.set()
+            return result
+
+        det.bus.receive.side_effect = receive
+        det._main_loop()
+        assert det._buffered == 1024
+        assert det._warned_no_pcm
+
+
+# ---------------------------------------------------------------------------
+# Sample-rate validation
+# ---------------------------------------------------------------------------
+
+class TestSampleRate:
+    """Only audio at the feature extractor's rate (16 kHz) is analysed."""
+
+    @staticmethod
+    def _feed(det: StressDetector, rate: Any) -> int:
+        """Run the main loop over one 1024-sample chunk; return samples kept."""
+        messages = iter([("audio", {
+            "data": {"sample_rate": rate},
+            "binary": np.zeros(1024, dtype=np.int16).tobytes(),
+        })])
+
+        def receive(*args: Any, **kwargs: Any) -> Any:
+            result = next(messages, None)
+            if result is None:
+                det._stop_event.set()
+            return result
+
+        det.bus.receive.side_effect = receive
+        det._main_loop()
+        return det._buffered
+
+    def test_rate_comes_from_feature_extractor(self) -> None:
+        assert _make_detector()._sample_rate == 16000
+
+    @pytest.mark.parametrize("rate", [16000, 16000.0, "16000"])
+    def test_accepts_model_rate(self, rate: Any) -> None:
+        assert self._feed(_make_detector(), rate) == 1024
+
+    @pytest.mark.parametrize("rate", [44100, 48000.0, "8000", "fast", None])
+    def test_rejects_other_rates(self, rate: Any) -> None:
+        det = _make_detector()
+        assert self._feed(det, rate) == 0
+        assert det._sample_rate == 16000
+
+
+# ---------------------------------------------------------------------------
+# CUDA graphs
+# ---------------------------------------------------------------------------
+
+class TestCudaGraphs:
+    """One graph per batch size, all drawing on a single memory pool."""
+
+    def test_later_captures_share_first_pool(self) -> None:
+        det = _make_detector()
+        det._use_graph = True
+        n = det.window_samples
+        with patch("src.core.stress_detector.torch.cuda") as cuda:
+            cuda.CUDAGraph.side_effect = lambda: MagicMock()
+            graphs = [det._graph_for(k, n)[0] for k in (1, 2, 3)]
+            assert det._graph_for(2, n)[0] is graphs[1]  # cached, not recaptured
+
+        pools = [c.kwargs["pool"] for c in cuda.graph.call_args_list]
+        assert pools == [None, graphs[0].pool.return_value, graphs[0].pool.return_value]
+
+
+# ---------------------------------------------------------------------------
+# Input normalisation
+# ---------------------------------------------------------------------------
+
+def _model_input(det: StressDetector, windows: np.ndarray) -> torch.Tensor:
+    """Run _predict_batch and return the tensor handed to the model."""
+    det._predict_batch(windows)
+    return det._model.call_args.args[0]
+
+
+class TestNormalisation:
+    """_predict_batch must produce exactly the feature extractor's input."""
+
+    @staticmethod
+    def _windows(k: int, n: int = 1600) -> np.ndarray:
+        rng = np.random.default_rng(k)
+        # Distinct offset and scale per row, so cross-row statistics would show.
+        scale = rng.uniform(0.01, 0.5, size=(k, 1))
+        offset = rng.uniform(-0.1, 0.1, size=(k, 1))
+        return (rng.standard_normal((k, n)) * scale + offset).astype(np.float32)
+
+    def test_matches_feature_extractor(self) -> None:
+        det = _make_detector()
+        windows = self._windows(1, 40000)
+        expected = Wav2Vec2FeatureExtractor(do_normalize=True)(
+            windows[0], sampling_rate=16000, return_tensors="pt",
+        )["input_values"]
+        torch.testing.assert_close(_model_input(det, windows), expected, rtol=0, atol=0)
+
+    def test_staging_path_matches_feature_extractor(self) -> None:
+        """The CUDA path writes into the staging tensor; check what lands there."""
+        det = _make_detector()
+        det._staging = lambda k, n: torch.empty(k, n)  # unpinned stand-in
+        windows = self._windows(1, 40000)
+        expected = Wav2Vec2FeatureExtractor(do_normalize=True)(
+            windows[0], sampling_rate=16000, return_tensors="pt",
+        )["input_values"]
+        torch.testing.assert_close(_model_input(det, windows), expected, rtol=0, atol=0)
+
+    def test_partial_batch_matches_padded_extractor_batch(self) -> None:
+        """Rows are normalised independently, as the extractor does per input.
+
+        Batch windows are always full length, so the extractor pads nothing
+        and its attention mask is all ones; the inline path needs no mask.
+        """
+        det = _make_detector()
+        windows = self._windows(_MAX_BATCH - 1)
+        features = Wav2Vec2FeatureExtractor(do_normalize=True, return_attention_mask=True)(
+            list(windows), sampling_rate=16000, padding="longest", return_tensors="pt",
+        )
+        assert bool(features["attention_mask"].all())
+
+        got = _model_input(det, windows)
+        assert got.shape == (_MAX_BATCH - 1, windows.shape[1])
+        torch.testing.assert_close(got, features["input_values"], rtol=0, atol=0)
+
+    def test_do_normalize_false_passes_audio_through(self) -> None:
+        det = _make_detector()
+        det._do_normalize = False
+        windows = self._windows(2)
+        torch.testing.assert_close(_model_input(det, windows), torch.from_numpy(windows))
@@ -0,0 +1,183 @@
+"""Unit tests for src.core.system_monitor – Jetson system metrics.
+
+Hardware-independent: tegrastats is replaced by a fake ``Popen`` whose
+stdout is a list of lines, and the message bus is mocked.
+
+Tests cover:
+    - Parsing real tegrastats lines (Orin Nano, AGX Orin, Xavier NX)
+    - Reader thread publishes each tegrastats line as it arrives
+    - Cached line is cleared when tegrastats exits, then relaunched
+    - No relaunch, and no leftover process, once the monitor is stopping
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Iterable, Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.core.system_monitor import SystemMonitor, _parse_tegrastats_line
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+ORIN_NANO_LINE = (
+    "12-03-2024 14:22:01 RAM 3181/7620MB (lfb 1x4MB) SWAP 0/3810MB (cached 0MB) "
+    "CPU [2%@729,1%@729,0%@729,1%@729,0%@729,0%@729] EMC_FREQ 0%@2133 "
+    "GR3D_FREQ 0%@[305] NVENC off NVDEC off NVJPG off NVJPG1 off VIC off OFA off "
+    "APE 200 cpu@49.968C soc2@48.593C soc0@48.937C gpu@49.406C tj@49.968C "
+    "soc1@48.375C VDD_IN 4715mW/4715mW VDD_CPU_GPU_CV 567mW/567mW VDD_SOC 1416mW/1416mW"
+)
+
+AGX_ORIN_LINE = (
+    "RAM 4722/30536MB (lfb 6377x4MB) SWAP 0/15268MB (cached 0MB) "
+    "CPU [1%@729,0%@729,0%@729,0%@729,0%@729,0%@729,0%@729,0%@729,off,off,off,off] "
+    "EMC_FREQ 0%@3199 GR3D_FREQ 0%@[0,0] VIC_FREQ 115 APE 174 CV0@-256C CPU@46.656C "
+    "SOC2@43.531C SOC0@44.125C CV1@-256C GPU@-256C tj@46.656C SOC1@43.343C CV2@-256C "
+    "VDD_GPU_SOC 2807mW/2807mW VDD_CPU_CV 401mW/401mW VIN_SYS_5V0 3320mW/3320mW "
+    "VDDQ_VDD2_1V8AO 401mW/401mW"
+)
+
+XAVIER_NX_LINE = (
+    "RAM 2913/7772MB (lfb 139x4MB) SWAP 0/3886MB (cached 0MB) "
+    "CPU [9%@1190,6%@1190,3%@1190,4%@1190,off,off] EMC_FREQ 1%@1600 GR3D_FREQ 0%@114 "
+    "APE 150 MTS fg 0% bg 0% AO@33.5C GPU@33C PMIC@100C AUX@33C CPU@35.5C "
+    "thermal@34.4C VDD_IN 3956/3956 VDD_CPU_GPU_CV 612/612 VDD_SOC 1224/1224"
+)
+
+
+def _fake_popen(lines: Iterable[str], returncode: int = 0) -> MagicMock:
+    """A stand-in tegrastats process that prints ``lines`` and exits."""
+    proc = MagicMock()
+    proc.stdout.__iter__.return_value = iter(lines)
+    proc.wait.return_value = returncode
+    return proc
+
+
+@pytest.fixture()
+def monitor() -> SystemMonitor:
+    return SystemMonitor(bus=MagicMock())
+
+
+# ---------------------------------------------------------------------------
+# tegrastats parsing
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize(("line", "expected"), [
+    pytest.param(ORIN_NANO_LINE, {
+        "ram_used_mb": 3181, "ram_total_mb": 7620,
+        "swap_used_mb": 0, "swap_total_mb": 3810,
+        "cpu_percent_per_core": [2.0, 1.0, 0.0, 1.0, 0.0, 0.0], "cpu_freq_mhz": 729.0,
+        "emc_freq_mhz": 2133,
+        "gpu_percent": 0, "gpu_temp_c": 49.4, "gpu_freq_mhz": 305,
+        "power_mw": 567,
+    }, id="orin-nano"),
+    pytest.param(AGX_ORIN_LINE, {
+        "ram_used_mb": 4722, "ram_total_mb": 30536,
+        "swap_used_mb": 0, "swap_total_mb": 15268,
+        "cpu_percent_per_core": [1.0] + [0.0] * 7, "cpu_freq_mhz": 729.0,
+        "emc_freq_mhz": 3199,
+        "gpu_percent": 0, "gpu_freq_mhz": 0,
+    }, id="agx-orin"),
+    pytest.param(XAVIER_NX_LINE, {
+        "ram_used_mb": 2913, "ram_total_mb": 7772,
+        "swap_used_mb": 0, "swap_total_mb": 3886,
+        "cpu_percent_per_core": [9.0, 6.0, 3.0, 4.0], "cpu_freq_mhz": 1190.0,
+        "emc_freq_mhz": 1600,
+        "gpu_percent": 0, "gpu_freq_mhz": 114,
+        "power_mw": 612,
+    }, id="xavier-nx"),
+])
+def test_parse_tegrastats_line(line: str, expected: dict[str, Any]) -> None:
+    assert _parse_tegrastats_line(line) == expected
+
+
+def test_parse_tegrastats_line_ignores_garbage() -> None:
+    assert _parse_tegrastats_line("tegrastats: permission denied") == {}
+
+
+# ---------------------------------------------------------------------------
+# tegrastats reader
+# ---------------------------------------------------------------------------
+
+class TestTegrastatsReader:
+    """The cached line tracks tegrastats output and never outlives it."""
+
+    def test_each_line_updates_cache(self, monitor: SystemMonitor) -> None:
+        seen: list[dict[str, Any] | None] = []
+
+        def lines() -> Iterator[str]:
+            yield ORIN_NANO_LINE.replace("RAM 3181/", "RAM 3000/") + "\n"
+            seen.append(monitor._last_tegra)
+            yield ORIN_NANO_LINE + "\n"
+            seen.append(monitor._last_tegra)
+
+        monitor._stop.set()
+        monitor._read_tegrastats(_fake_popen(lines()))
+
+        assert [t["ram_used_mb"] for t in seen] == [3000, 3181]
+        assert seen[1]["gpu_temp_c"] == 49.4
+
+    def test_exit_clears_cache(self, monitor: SystemMonitor) -> None:
+        monitor._stop.set()
+        monitor._read_tegrastats(_fake_popen([ORIN_NANO_LINE + "\n"]))
+        assert monitor._last_tegra is None
+
+    def test_unexpected_exit_relaunches(self, monitor: SystemMonitor) -> None:
+        first = _fake_popen([ORIN_NANO_LINE + "\n"], returncode=1)
+        with patch("src.core.system_monitor._TEGRASTATS_RESTART_S", 0), \
+                patch("src.core.system_monitor.subprocess.Popen",
+                      side_effect=[first, FileNotFoundError]) as popen:
+            monitor._start_tegrastats(500)
+            monitor._tegrastats_thread.join(timeout=2)
+
+        assert popen.call_count == 2
+        assert popen.call_args.args[0] == ["tegrastats", "--interval", "500"]
+        first.stdout.close.assert_called_once()  # pipe released and
+        first.wait.assert_called_once()  # process reaped before the relaunch
+        assert monitor._last_tegra is None
+
+    def test_no_relaunch_while_stopping(self, monitor: SystemMonitor) -> None:
+        def lines() -> Iterator[str]:
+            yield ORIN_NANO_LINE + "\n"
+            monitor._stop.set()  # shutdown begins as tegrastats exits
+
+        with patch("src.core.system_monitor.subprocess.Popen",
+                   return_value=_fake_popen(lines())) as popen:
+            monitor._start_tegrastats(500)
+            monitor._tegrastats_thread.join(timeout=2)
+
+        assert popen.call_count == 1
+        assert monitor._last_tegra is None
+
+    def test_no_launch_once_stopped(self, monitor: SystemMonitor) -> None:
+        monitor._stop.set()
+        with patch("src.core.system_monitor.subprocess.Popen") as popen:
+            monitor._start_tegrastats(500)
+        popen.assert_not_called()
+        assert monitor._tegrastats_thread is None
+
+    def test_stop_terminates_and_joins_reader(self, monitor: SystemMonitor) -> None:
+        terminated = threading.Event()
+
+        def lines() -> Iterator[str]:
+            yield ORIN_NANO_LINE + "\n"
+            terminated.wait(timeout=5)  # stdout stays open until terminate()
+
+        proc = _fake_popen(lines())
+        proc.terminate.side_effect = terminated.set
+        with patch("src.core.system_monitor.subprocess.Popen", return_value=proc):
+            monitor._start_tegrastats(500)
+        reader = monitor._tegrastats_thread
+
+        monitor._stop.set()
+        monitor._stop_tegrastats()
+
+        proc.terminate.assert_called_once()
+        assert not reader.is_alive()
+        assert monitor._tegrastats_proc is None
+        assert monitor._last_tegra is None